@@ -1,12 +1,12 @@
 """POST /api/analyze — Full pipeline analysis of a transcript."""
 
 import hashlib
-import json
 import logging
 import os
 from datetime import date
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
@@ -36,15 +36,15 @@ def _get_cached(transcript: str) -> dict | None:
     path = os.path.join(CACHE_DIR, f"{_cache_key(transcript)}.json")
     if os.path.exists(path):
         logger.info(f"Cache HIT — loading from {path}")
-        with open(path) as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     return None
 
 
 def _save_cache(transcript: str, data: dict):
     path = os.path.join(CACHE_DIR, f"{_cache_key(transcript)}.json")
-    with open(path, "w") as f:
-        json.dump(data, f)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data))
     logger.info(f"Cache SAVED — {path}")
 
 
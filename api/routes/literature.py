@@ -1,10 +1,8 @@
 """GET /api/literature/{visit_id} — Semantic Scholar papers for a visit."""
 
-import json
-
 from fastapi import APIRouter, HTTPException, Query
 
-from models.database import get_visit, _get_connection
+from models.database import get_visit, update_literature_results
 from core.literature_search import search_literature
 from api.dependencies import visit_not_found
 
@@ -45,14 +43,6 @@ async def get_literature(
 
     # Update cached results in database
     if papers:
-        conn = _get_connection()
-        try:
-            conn.execute(
-                "UPDATE visits SET literature_results_json = ? WHERE id = ?",
-                (json.dumps([p.model_dump() for p in papers]), visit_id),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        update_literature_results(visit_id, papers)
 
     return [r.model_dump() for r in papers]
@@ -1,16 +1,17 @@
 """POST /api/transcribe — Audio transcription with PHI redaction."""
 
 import hashlib
-import json
 import os
 import tempfile
 import logging
 
+import orjson
 from fastapi import APIRouter, UploadFile, File, HTTPException
 
-from core.transcription import transcribe_audio
+from core.transcription import transcribe_audio_async
 from core.phi_redaction import redact_phi
 from api.dependencies import get_temp_dir
+from app.config import WHISPER_MODEL_SIZE
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -21,7 +22,12 @@ os.makedirs(CACHE_DIR, exist_ok=True)
 
 
 def _audio_hash(data: bytes) -> str:
-    return "tr_" + hashlib.sha256(data).hexdigest()[:16]
+    """Cache key for an upload: BLAKE2b of the audio bytes plus the model size.
+
+    Including the model size keeps a WHISPER_MODEL_SIZE change from serving
+    transcripts produced by a different model.
+    """
+    return f"tr_{WHISPER_MODEL_SIZE}_" + hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 @router.post("/api/transcribe")
@@ -55,14 +61,14 @@ async def transcribe(file: UploadFile = File(...)):
         cache_path = os.path.join(CACHE_DIR, f"{audio_key}.json")
         if os.path.exists(cache_path):
             logger.info(f"Transcription cache HIT — {cache_path}")
-            with open(cache_path) as f:
-                return json.load(f)
+            with open(cache_path, "rb") as f:
+                return orjson.loads(f.read())
 
         with open(tmp_path, "wb") as f:
             f.write(contents)
 
-        # Transcribe
-        transcription = transcribe_audio(tmp_path)
+        # Transcribe (off the event loop)
+        transcription = await transcribe_audio_async(tmp_path)
 
         # Redact PHI — this runs BEFORE any storage
         redaction = redact_phi(transcription.text)
@@ -88,9 +94,17 @@ async def transcribe(file: UploadFile = File(...)):
             "entity_count": redaction.entity_count,
         }
 
-        # Save to demo cache
-        with open(cache_path, "w") as f:
-            json.dump(result, f)
+        # Save to demo cache (write-then-rename so readers never see a partial
+        # file; a unique temp name per writer so concurrent uploads of the same
+        # audio don't write into each other's temp file)
+        fd, tmp_cache_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f"{audio_key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(result))
+            os.replace(tmp_cache_path, cache_path)
+        except Exception:
+            os.remove(tmp_cache_path)
+            raise
         logger.info(f"Transcription cache SAVED — {cache_path}")
 
         return result
@@ -21,9 +21,10 @@ async def list_visits(
     sort: str = Query("date", description="Sort order: date"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    light: bool = Query(False, description="Omit trials, literature, and transcript segments"),
 ):
     """List all visits with optional search, tag filter, and pagination."""
-    visits = get_all_visits(search=search, tag=tag, sort=sort, limit=limit, offset=offset)
+    visits = get_all_visits(search=search, tag=tag, sort=sort, limit=limit, offset=offset, light=light)
     return [v.model_dump() for v in visits]
 
 
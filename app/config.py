@@ -21,9 +21,15 @@ def _detect_device() -> str:
     return "cpu"
 
 WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", _detect_device())
+# Max VAD chunks decoded per batch by the batched Whisper pipeline
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "16"))
+# Load and warm up the Whisper model at API startup instead of on first request
+WHISPER_WARMUP = os.getenv("WHISPER_WARMUP", "true").lower() == "true"
 
 # Database
 DATABASE_PATH = os.getenv("DATABASE_PATH", "data/medsift.db")
+# Idle SQLite connections kept open for reuse (busier moments open extra ones)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
 
 # External APIs
 CLINICAL_TRIALS_API = "https://clinicaltrials.gov/api/v2/studies"
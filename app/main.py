@@ -6,7 +6,9 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from models.database import init_db
+from models.database import init_db, close_pool
+from core.transcription import warmup as warmup_whisper
+from app.config import WHISPER_WARMUP
 from api.routes import transcribe, analyze, visits, export, trials, literature, feedback, analytics, live_transcribe, grounding
 
 logging.basicConfig(level=logging.INFO)
@@ -20,9 +22,17 @@ async def lifespan(app: FastAPI):
     logger.info("Initializing MedSift AI...")
     init_db()
     logger.info("Database initialized")
+    if WHISPER_WARMUP:
+        # Best-effort: a model that can't load here still loads lazily on the
+        # first /api/transcribe, and must not keep the rest of the API down
+        try:
+            warmup_whisper()
+        except Exception as e:
+            logger.warning(f"Whisper warmup failed, model will load on first request: {e}")
     yield
     # Shutdown
     logger.info("MedSift AI shutting down")
+    close_pool()
 
 
 app = FastAPI(
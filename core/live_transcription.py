@@ -4,7 +4,6 @@ Buffers audio chunks from the browser, transcribes each with Whisper,
 applies PHI redaction, and accumulates results across chunks.
 """
 
-import asyncio
 import os
 import logging
 import tempfile
@@ -12,7 +11,7 @@ import time
 from dataclasses import dataclass, field
 from typing import Optional
 
-from core.transcription import transcribe_audio
+from core.transcription import transcribe_audio_async
 from core.phi_redaction import redact_phi
 from models.schemas import TranscriptSegment
 
@@ -112,11 +111,8 @@ async def process_audio_chunk(
         f.write(raw_audio_bytes)
 
     try:
-        # Run blocking Whisper call in thread pool
-        loop = asyncio.get_event_loop()
-        transcription = await loop.run_in_executor(
-            None, lambda: transcribe_audio(tmp_path)
-        )
+        # Run blocking Whisper call in a worker thread
+        transcription = await transcribe_audio_async(tmp_path)
     finally:
         # HIPAA: delete temp audio immediately
         if os.path.exists(tmp_path):
@@ -7,7 +7,9 @@ hallucinations for clinician review.
 
 import logging
 import re
-from difflib import SequenceMatcher
+from typing import Optional
+
+from rapidfuzz import fuzz, process
 
 from models.schemas import PatientSummary, ClinicianNote
 
@@ -16,16 +18,28 @@ logger = logging.getLogger(__name__)
 
 # ── Grounding Score Engine ────────────────────────────────────────────────────
 
+# Words of 3+ characters, used for claim/transcript overlap scoring
+_WORD_RE = re.compile(r'\b\w{3,}\b')
+
+# Checked in order; the first match wins
+_STEM_SUFFIXES = ("ation", "ment", "ized", "izing", "tion", "sion", "ing", "ness", "ity", "ous", "ive", "able", "ible", "ally", "ful", "less", "er", "ed", "ly", "es", "s")
+
+
 def _stem(word: str) -> str:
-    """Poor-man s stemmer: strip common suffixes for matching."""
-    w = word.lower()
-    for suffix in ("ation", "ment", "ized", "izing", "tion", "sion", "ing", "ness", "ity", "ous", "ive", "able", "ible", "ally", "ful", "less", "er", "ed", "ly", "es", "s"):
-        if len(w) > len(suffix) + 3 and w.endswith(suffix):
-            return w[:-len(suffix)]
-    return w
+    """Poor-man s stemmer: strip common suffixes for matching.
+
+    Expects an already-lowercase word (see MEDICAL_SYNONYMS below). Only
+    used at import time to precompute _SYNONYM_EXPANSIONS.
+    """
+    for suffix in _STEM_SUFFIXES:
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
 
 
-# Common medical abbreviations/synonyms
+# Common medical abbreviations/synonyms.
+# Invariant: keys and values are lowercase literals, so lookups and _stem
+# calls never need to re-lowercase them.
 MEDICAL_SYNONYMS = {
     'rehab': 'rehabilitation', 'rehabilitation': 'rehab',
     'exam': 'examination', 'examination': 'exam',
@@ -39,73 +53,91 @@ MEDICAL_SYNONYMS = {
 }
 
 
+# Precomputed expansion per synonym key: the synonym and its stem
+_SYNONYM_EXPANSIONS = {
+    w: frozenset((syn, _stem(syn))) for w, syn in MEDICAL_SYNONYMS.items()
+}
+
+
 def _expand_synonyms(words: set) -> set:
     """Expand word set with known medical synonyms."""
     expanded = set(words)
-    for w in words:
-        if w in MEDICAL_SYNONYMS:
-            syn = MEDICAL_SYNONYMS[w]
-            expanded.add(_stem(syn))
-            expanded.add(syn)
+    for w in words & _SYNONYM_EXPANSIONS.keys():
+        expanded |= _SYNONYM_EXPANSIONS[w]
     return expanded
 
 
-def _word_overlap_score(text: str, transcript: str) -> float:
-    """Compute word overlap ratio between text and transcript (0.0–1.0)."""
-    if not text or not transcript:
+def _prepare_transcript(transcript_lower: str) -> tuple[set, set]:
+    """Tokenize the (lowercased) transcript once for word-overlap scoring.
+
+    Returns (transcript_words, synonym-expanded transcript_words).
+    """
+    transcript_words = set(_WORD_RE.findall(transcript_lower))
+    return transcript_words, _expand_synonyms(transcript_words)
+
+
+def _word_overlap_score(text: str, transcript_words: set, expanded_transcript: set) -> float:
+    """Compute word overlap ratio between text and transcript (0.0–1.0).
+
+    Takes the transcript pre-tokenized by _prepare_transcript.
+    """
+    if not text or not transcript_words:
         return 0.0
-    text_words = set(w.lower() for w in re.findall(r'\b\w{3,}\b', text))
-    transcript_words = set(w.lower() for w in re.findall(r'\b\w{3,}\b', transcript))
+    text_words = set(_WORD_RE.findall(text.lower()))
     if not text_words:
         return 0.0
     # Direct overlap
     overlap = text_words & transcript_words
     # Synonym-expanded overlap
     expanded_text = _expand_synonyms(text_words)
-    expanded_transcript = _expand_synonyms(transcript_words)
     synonym_overlap = expanded_text & expanded_transcript
     best_overlap = max(len(overlap), len(synonym_overlap))
     return min(1.0, best_overlap / len(text_words))
 
 
-def _fuzzy_substring_score(evidence: str, transcript: str) -> float:
-    """Find best fuzzy match of evidence in transcript (0.0–1.0).
-    
-    Slides a window across the transcript and finds the best match ratio.
-    For performance, samples windows rather than checking every position.
+def _batch_evidence_scores(evidences: list[str], transcript_lower: str) -> list[float]:
+    """Score every evidence quote against the transcript (0.0–1.0 each).
+
+    Blank quotes score 0.0 and exact substrings short-circuit to 1.0. The
+    remaining quotes are scored by RapidFuzz's partial_ratio (best alignment
+    of the quote anywhere in the transcript) in one cdist call, which runs
+    in native code across all cores with the GIL released.
     """
-    if not evidence or not transcript:
-        return 0.0
-    evidence_lower = evidence.lower().strip()
-    transcript_lower = transcript.lower()
-    
-    # Exact match
-    if evidence_lower in transcript_lower:
-        return 1.0
-    
-    # Sliding window fuzzy match (sampled for performance)
-    window_size = len(evidence_lower)
-    if window_size > len(transcript_lower):
-        return _word_overlap_score(evidence, transcript)
-    
-    best_ratio = 0.0
-    step = max(1, window_size // 4)  # Sample every quarter-window
-    for i in range(0, len(transcript_lower) - window_size + 1, step):
-        chunk = transcript_lower[i:i + window_size]
-        ratio = SequenceMatcher(None, evidence_lower, chunk).ratio()
-        if ratio > best_ratio:
-            best_ratio = ratio
-            if ratio > 0.9:  # Early exit on very good match
-                break
-    return best_ratio
+    scores = [0.0] * len(evidences)
+    fuzzy_idx = []
+    fuzzy_queries = []
+    for i, evidence in enumerate(evidences):
+        if not evidence or not evidence.strip() or not transcript_lower:
+            continue
+        evidence_lower = evidence.lower().strip()
+        # Well-behaved extractions quote the transcript verbatim; skip the
+        # fuzzy alignment search when the quote is an exact substring.
+        if evidence_lower in transcript_lower:
+            scores[i] = 1.0
+        else:
+            fuzzy_idx.append(i)
+            fuzzy_queries.append(evidence_lower)
+
+    if fuzzy_queries:
+        matrix = process.cdist(
+            fuzzy_queries, [transcript_lower], scorer=fuzz.partial_ratio, workers=-1,
+        )
+        for i, row in zip(fuzzy_idx, matrix):
+            scores[i] = float(row[0]) / 100.0
+    return scores
 
 
 def _compute_item_grounding(
     claim: str,
     evidence: str,
-    transcript: str,
+    evidence_score: float,
+    transcript_words: set,
+    expanded_transcript: set,
 ) -> dict:
     """Compute grounding score for a single extracted item.
+
+    Takes the evidence score from _batch_evidence_scores and the transcript
+    pre-tokenized by _prepare_transcript.
     
     Returns:
         {
@@ -125,14 +157,10 @@ def _compute_item_grounding(
     }
     
     # Score 1: Does the evidence quote exist in the transcript? (0–50 points)
-    if evidence and evidence.strip():
-        evidence_score = _fuzzy_substring_score(evidence, transcript)
-        result["evidence_match"] = round(evidence_score, 3)
-    else:
-        evidence_score = 0.0
+    result["evidence_match"] = round(evidence_score, 3)
     
     # Score 2: Do the claim's key terms appear in the transcript? (0–50 points)
-    claim_score = _word_overlap_score(claim, transcript)
+    claim_score = _word_overlap_score(claim, transcript_words, expanded_transcript)
     result["claim_support"] = round(claim_score, 3)
     
     # Combined score: evidence match (50%) + claim support (50%)
@@ -172,70 +200,51 @@ def compute_grounding_report(
     - total_items, grounded_count, flagged_count
     - items: list of per-item scores grouped by category
     """
-    items = []
+    # Collect (category, item, index, claim, evidence) for every extracted item
+    tasks = []
     
     # Patient summary items
     for i, med in enumerate(patient_summary.medications):
-        g = _compute_item_grounding(
-            claim=f"{med.name} {med.dose} {med.frequency}".strip(),
-            evidence=med.evidence,
-            transcript=transcript,
-        )
-        items.append({"category": "medication", "item": med.name, "index": i, **g})
-    
+        claim = f"{med.name} {med.dose} {med.frequency}".strip()
+        tasks.append(("medication", med.name, i, claim, med.evidence))
     for i, test in enumerate(patient_summary.tests_ordered):
-        g = _compute_item_grounding(
-            claim=test.test_name,
-            evidence=test.evidence,
-            transcript=transcript,
-        )
-        items.append({"category": "test_ordered", "item": test.test_name, "index": i, **g})
-    
+        tasks.append(("test_ordered", test.test_name, i, test.test_name, test.evidence))
     for i, fu in enumerate(patient_summary.follow_up_plan):
-        g = _compute_item_grounding(
-            claim=fu.action,
-            evidence=fu.evidence,
-            transcript=transcript,
-        )
-        items.append({"category": "follow_up", "item": fu.action, "index": i, **g})
-    
+        tasks.append(("follow_up", fu.action, i, fu.action, fu.evidence))
     for i, rec in enumerate(patient_summary.lifestyle_recommendations):
-        g = _compute_item_grounding(
-            claim=rec.recommendation,
-            evidence=rec.evidence,
-            transcript=transcript,
-        )
-        items.append({"category": "lifestyle", "item": rec.recommendation, "index": i, **g})
-    
+        tasks.append(("lifestyle", rec.recommendation, i, rec.recommendation, rec.evidence))
     for i, rf in enumerate(patient_summary.red_flags_for_patient):
-        g = _compute_item_grounding(
-            claim=rf.warning,
-            evidence=rf.evidence,
-            transcript=transcript,
-        )
-        items.append({"category": "red_flag", "item": rf.warning, "index": i, **g})
+        tasks.append(("red_flag", rf.warning, i, rf.warning, rf.evidence))
     
-    # Clinician note: SOAP findings grounded in transcript
-    for i, finding in enumerate(clinician_note.soap_note.subjective.findings):
-        g = _compute_item_grounding(claim=finding, evidence="", transcript=transcript)
-        items.append({"category": "soap_subjective", "item": finding, "index": i, **g})
-    
-    for i, finding in enumerate(clinician_note.soap_note.assessment.findings):
-        g = _compute_item_grounding(claim=finding, evidence="", transcript=transcript)
-        items.append({"category": "soap_assessment", "item": finding, "index": i, **g})
-    
-    for i, finding in enumerate(clinician_note.soap_note.plan.findings):
-        g = _compute_item_grounding(claim=finding, evidence="", transcript=transcript)
-        items.append({"category": "soap_plan", "item": finding, "index": i, **g})
+    # Clinician note: SOAP findings grounded in transcript (no evidence quotes)
+    soap = clinician_note.soap_note
+    for i, finding in enumerate(soap.subjective.findings):
+        tasks.append(("soap_subjective", finding, i, finding, ""))
+    for i, finding in enumerate(soap.assessment.findings):
+        tasks.append(("soap_assessment", finding, i, finding, ""))
+    for i, finding in enumerate(soap.plan.findings):
+        tasks.append(("soap_plan", finding, i, finding, ""))
     
     # Action items
     for i, action in enumerate(clinician_note.action_items):
+        tasks.append(("action_item", action.action, i, action.action, action.evidence))
+    
+    # Lowercase and tokenize the transcript once, then fuzzy-match all
+    # evidence quotes in a single batch
+    transcript_lower = transcript.lower()
+    transcript_words, expanded_transcript = _prepare_transcript(transcript_lower)
+    evidence_scores = _batch_evidence_scores([t[4] for t in tasks], transcript_lower)
+    
+    items = []
+    for (category, item, index, claim, evidence), evidence_score in zip(tasks, evidence_scores):
         g = _compute_item_grounding(
-            claim=action.action,
-            evidence=action.evidence,
-            transcript=transcript,
+            claim=claim,
+            evidence=evidence,
+            evidence_score=evidence_score,
+            transcript_words=transcript_words,
+            expanded_transcript=expanded_transcript,
         )
-        items.append({"category": "action_item", "item": action.action, "index": i, **g})
+        items.append({"category": category, "item": item, "index": index, **g})
     
     # Compute overall score
     total = len(items)
@@ -274,19 +283,30 @@ def compute_grounding_report(
     }
 
 
-# ── Original Validation (unchanged) ──────────────────────────────────────────
+# ── Evidence Validation ──────────────────────────────────────────────────────
 
-def _check_evidence(evidence: str, transcript: str) -> bool:
+def _check_evidence(
+    evidence: str,
+    transcript_lower: str,
+    word_hits: Optional[dict[str, bool]] = None,
+    transcript_words: frozenset = frozenset(),
+) -> bool:
     """Check if evidence text is grounded in the transcript.
 
-    Uses two strategies:
+    Takes the transcript already lowercased so callers validating many
+    items lowercase it once. Uses two strategies:
     1. Exact case-insensitive substring match
     2. Loose match — 60%+ of key words (>3 chars) appear in transcript
+
+    word_hits memoizes per-word transcript scans; share one dict across a
+    validation pass so words repeated between items are scanned once.
+    transcript_words (the transcript's _WORD_RE tokens) answers whole-word
+    hits by set lookup; only words missing from it fall back to the
+    substring scan, so partial-word matches still count.
     """
     if not evidence or not evidence.strip():
         return False
 
-    transcript_lower = transcript.lower()
     evidence_lower = evidence.strip().lower()
 
     # Strategy 1: exact substring
@@ -297,71 +317,69 @@ def _check_evidence(evidence: str, transcript: str) -> bool:
     words = [w for w in evidence_lower.split() if len(w) > 3]
     if not words:
         return False
-    matches = sum(1 for w in words if w in transcript_lower)
+    if word_hits is None:
+        word_hits = {}
+    matches = 0
+    for w in words:
+        hit = word_hits.get(w)
+        if hit is None:
+            hit = word_hits[w] = w in transcript_words or w in transcript_lower
+        matches += hit
     return matches / len(words) >= 0.6
 
 
+def _validate_items(
+    items: list,
+    name_field: str,
+    transcript_lower: str,
+    transcript_words: frozenset,
+    word_hits: dict[str, bool],
+) -> list:
+    """Drop items whose name_field is blank; mark the rest verified or not."""
+    valid = []
+    for item in items:
+        if not getattr(item, name_field).strip():
+            continue
+        item.verified = _check_evidence(item.evidence, transcript_lower, word_hits, transcript_words)
+        valid.append(item)
+    return valid
+
+
 def validate_patient_summary(
     summary: PatientSummary,
     transcript: str,
 ) -> PatientSummary:
     """Validate a PatientSummary against the source transcript."""
-    valid_meds = []
-    for med in summary.medications:
-        if not med.name.strip():
-            continue
-        med.verified = _check_evidence(med.evidence, transcript)
-        valid_meds.append(med)
-
-    valid_tests = []
-    for test in summary.tests_ordered:
-        if not test.test_name.strip():
-            continue
-        test.verified = _check_evidence(test.evidence, transcript)
-        valid_tests.append(test)
-
-    valid_followups = []
-    for fu in summary.follow_up_plan:
-        if not fu.action.strip():
-            continue
-        fu.verified = _check_evidence(fu.evidence, transcript)
-        valid_followups.append(fu)
-
-    valid_lifestyle = []
-    for rec in summary.lifestyle_recommendations:
-        if not rec.recommendation.strip():
-            continue
-        rec.verified = _check_evidence(rec.evidence, transcript)
-        valid_lifestyle.append(rec)
+    transcript_lower = transcript.lower()
+    transcript_words = frozenset(_WORD_RE.findall(transcript_lower))
+    word_hits: dict[str, bool] = {}
 
-    valid_flags = []
-    for rf in summary.red_flags_for_patient:
-        if not rf.warning.strip():
-            continue
-        rf.verified = _check_evidence(rf.evidence, transcript)
-        valid_flags.append(rf)
+    summary.medications = _validate_items(
+        summary.medications, "name", transcript_lower, transcript_words, word_hits,
+    )
+    summary.tests_ordered = _validate_items(
+        summary.tests_ordered, "test_name", transcript_lower, transcript_words, word_hits,
+    )
+    summary.follow_up_plan = _validate_items(
+        summary.follow_up_plan, "action", transcript_lower, transcript_words, word_hits,
+    )
+    summary.lifestyle_recommendations = _validate_items(
+        summary.lifestyle_recommendations, "recommendation", transcript_lower, transcript_words, word_hits,
+    )
+    summary.red_flags_for_patient = _validate_items(
+        summary.red_flags_for_patient, "warning", transcript_lower, transcript_words, word_hits,
+    )
+    summary.questions_and_answers = _validate_items(
+        summary.questions_and_answers, "question", transcript_lower, transcript_words, word_hits,
+    )
 
-    valid_qa = []
-    for qa in summary.questions_and_answers:
-        if not qa.question.strip():
-            continue
-        qa.verified = _check_evidence(qa.evidence, transcript)
-        valid_qa.append(qa)
-
-    summary.medications = valid_meds
-    summary.tests_ordered = valid_tests
-    summary.follow_up_plan = valid_followups
-    summary.lifestyle_recommendations = valid_lifestyle
-    summary.red_flags_for_patient = valid_flags
-    summary.questions_and_answers = valid_qa
-
-    total = (len(valid_meds) + len(valid_tests) + len(valid_followups)
-             + len(valid_lifestyle) + len(valid_flags) + len(valid_qa))
-    verified = sum(
-        1 for items in [valid_meds, valid_tests, valid_followups,
-                        valid_lifestyle, valid_flags, valid_qa]
-        for item in items if item.verified
+    sections = (
+        summary.medications, summary.tests_ordered, summary.follow_up_plan,
+        summary.lifestyle_recommendations, summary.red_flags_for_patient,
+        summary.questions_and_answers,
     )
+    total = sum(len(items) for items in sections)
+    verified = sum(1 for items in sections for item in items if item.verified)
     logger.info(f"Patient summary validation: {verified}/{total} items verified")
 
     return summary
@@ -372,6 +390,9 @@ def validate_clinician_note(
     transcript: str,
 ) -> ClinicianNote:
     """Validate a ClinicianNote against the source transcript."""
+    transcript_lower = transcript.lower()
+    transcript_words = frozenset(_WORD_RE.findall(transcript_lower))
+    word_hits: dict[str, bool] = {}
     soap = note.soap_note
     soap.subjective.findings = [f for f in soap.subjective.findings if f.strip()]
     soap.objective.vital_signs = [v for v in soap.objective.vital_signs if v.strip()]
@@ -381,13 +402,9 @@ def validate_clinician_note(
     soap.assessment.findings = [f for f in soap.assessment.findings if f.strip()]
     soap.plan.findings = [f for f in soap.plan.findings if f.strip()]
 
-    valid_actions = []
-    for item in note.action_items:
-        if not item.action.strip():
-            continue
-        item.verified = _check_evidence(item.evidence, transcript)
-        valid_actions.append(item)
-
+    valid_actions = _validate_items(
+        note.action_items, "action", transcript_lower, transcript_words, word_hits,
+    )
     note.action_items = valid_actions
     note.problem_list = [p for p in note.problem_list if p.strip()]
 
@@ -1,34 +1,227 @@
 """SQLite database setup, models, and CRUD operations."""
 
-import json
+import functools
+import queue
 import re
 import os
 import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
 from datetime import datetime, date
-from typing import Optional
+from types import UnionType
+from typing import Any, Callable, ContextManager, Iterator, Optional, TypeVar, Union, get_args, get_origin
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
 
 from models.schemas import (
-    VisitRecord, PatientSummary, ClinicianNote,
+    VisitRecord, VisitSummary, PatientSummary, ClinicianNote,
     ClinicalTrial, LiteratureResult, TranscriptSegment,
     FeedbackItem, FeedbackAnalytics, BoostedKeyword, AnalyticsSummary,
 )
-from app.config import DATABASE_PATH
-
-
-def _get_connection() -> sqlite3.Connection:
-    """Get a database connection with row factory."""
-    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+from app.config import DATABASE_PATH, DB_POOL_SIZE
+
+
+# How often the writer connection runs PRAGMA optimize (per SQLite's guidance
+# for long-lived connections)
+_OPTIMIZE_INTERVAL_SECONDS = 900
+
+
+class _ConnectionPool:
+    """Pooled read-only SQLite connections plus one shared writer connection.
+
+    Opening a connection per call re-opens the database, -wal and -shm files
+    and re-applies pragmas every time. Pooled connections are configured once
+    and handed out one caller at a time. If every pooled reader is busy, an
+    overflow reader is opened and closed on return, so readers never block
+    on the pool.
+
+    SQLite serializes writers even under WAL, so all writes go through a
+    single connection behind a lock rather than several connections racing
+    for the write lock. Readers are query_only and read their WAL snapshot
+    concurrently with the writer.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=size)
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
+        self._last_optimize = time.monotonic()
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        """Open a connection and apply per-connection pragmas once."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        else:
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL skips the fsync on every commit. Committed data still
+            # survives an app crash; only an OS crash/power loss can drop the
+            # last few transactions.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA wal_autocheckpoint=1000")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-16000")  # 16 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection; it goes back to the pool instead of closing."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect(read_only=True)
+        try:
+            yield conn
+        finally:
+            # End the read transaction so the next borrower sees fresh data
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared writer connection for the duration of the block."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect(read_only=False)
+            conn = self._writer
+            try:
+                yield conn
+            finally:
+                # Never hand an open transaction to the next writer
+                if conn.in_transaction:
+                    conn.rollback()
+                # Long-lived connections should re-run the planner's statistics
+                # refresh periodically; it's a no-op when nothing changed much
+                now = time.monotonic()
+                if now - self._last_optimize > _OPTIMIZE_INTERVAL_SECONDS:
+                    self._last_optimize = now
+                    conn.execute("PRAGMA optimize")
+
+    def close(self) -> None:
+        """Close every idle reader and the writer, refreshing planner stats first."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._writer_lock:
+            if self._writer is not None:
+                try:
+                    self._writer.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    pass
+                self._writer.close()
+                self._writer = None
+
+
+_pool: Optional[_ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> _ConnectionPool:
+    """Return the process-wide pool, creating it on first use.
+
+    The pool is bound to DATABASE_PATH at creation; call close_pool() before
+    pointing the module at a different file.
+    """
+    global _pool
+    pool = _pool
+    if pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _ConnectionPool(DATABASE_PATH, DB_POOL_SIZE)
+            pool = _pool
+    return pool
+
+
+def _reader() -> ContextManager[sqlite3.Connection]:
+    """Borrow a pooled read-only connection (use as a context manager)."""
+    return _get_pool().reader()
+
+
+def _writer() -> ContextManager[sqlite3.Connection]:
+    """Take the shared writer connection (use as a context manager)."""
+    return _get_pool().writer()
+
+
+def close_pool() -> None:
+    """Close all pooled connections (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+    with _analytics_lock:
+        _analytics_cache.clear()
+
+
+# Analytics results are reused until any write through this module, or for at
+# most this long (covers writes from other processes)
+_ANALYTICS_TTL_SECONDS = 30.0
+_write_version = 0
+_analytics_cache: dict[tuple[str, str], tuple[int, float, Any]] = {}
+# Guards _write_version and _analytics_cache only; never held while taking
+# another lock
+_analytics_lock = threading.Lock()
+
+_T = TypeVar("_T")
+
+
+def _bump_write_version() -> None:
+    """Invalidate cached analytics after a committed write.
+
+    Call it after the `with _writer()` block has exited, not inside it:
+    write paths must not hold the writer lock while taking another lock.
+    """
+    global _write_version
+    with _analytics_lock:
+        _write_version += 1
+
+
+def _cached_until_write(fn: Callable[[], _T]) -> Callable[[], _T]:
+    """Cache a zero-argument read until the next write or the TTL expires."""
+    @functools.wraps(fn)
+    def wrapper() -> _T:
+        key = (DATABASE_PATH, fn.__name__)
+        now = time.monotonic()
+        with _analytics_lock:
+            hit = _analytics_cache.get(key)
+            if hit and hit[0] == _write_version and hit[1] > now:
+                return hit[2]
+            # Read the version before computing so a concurrent write can't be missed
+            version = _write_version
+        # Computed outside the lock; concurrent misses may both run the query
+        value = fn()
+        with _analytics_lock:
+            _analytics_cache[key] = (version, now + _ANALYTICS_TTL_SECONDS, value)
+        return value
+    return wrapper
+
+
+# Kept separate so bulk_load_visits can drop and recreate it
+_FTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS visits_ai AFTER INSERT ON visits BEGIN
+        INSERT INTO visits_fts(rowid, raw_transcript, tags)
+        VALUES (new.id, new.raw_transcript, new.tags);
+    END
+"""
 
 
 def init_db() -> None:
     """Create all tables if they don't exist."""
-    conn = _get_connection()
-    try:
+    with _writer() as conn:
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS visits (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -63,11 +256,68 @@ def init_db() -> None:
                 keyword TEXT UNIQUE NOT NULL,
                 positive_count INTEGER DEFAULT 0,
                 negative_count INTEGER DEFAULT 0,
-                boost_score REAL DEFAULT 0.0,
+                boost_score REAL GENERATED ALWAYS AS (
+                    CAST(positive_count AS REAL) / MAX(positive_count + negative_count, 1)
+                ) STORED,
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
+
+            CREATE INDEX IF NOT EXISTS idx_visits_created_at ON visits(created_at DESC);
+
+            -- Covers the grouped count in get_feedback_analytics (index-only scan)
+            CREATE INDEX IF NOT EXISTS idx_feedback_type_item_rating
+                ON feedback(feedback_type, item_type, rating);
+            CREATE INDEX IF NOT EXISTS idx_feedback_visit ON feedback(visit_id, created_at DESC);
+
+            -- One row per (tag, visit) so tag filters are a B-tree lookup
+            -- instead of a LIKE scan over the JSON tags column
+            CREATE TABLE IF NOT EXISTS visit_tags (
+                tag TEXT NOT NULL COLLATE NOCASE,
+                visit_id INTEGER NOT NULL REFERENCES visits(id) ON DELETE CASCADE,
+                PRIMARY KEY (tag, visit_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_visit_tags_visit ON visit_tags(visit_id);
+
+            -- Cleaned assessment conditions, maintained on save/update so
+            -- analytics can count them in SQL
+            CREATE TABLE IF NOT EXISTS visit_conditions (
+                visit_id INTEGER NOT NULL REFERENCES visits(id) ON DELETE CASCADE,
+                condition TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_visit_conditions_visit ON visit_conditions(visit_id);
+            CREATE INDEX IF NOT EXISTS idx_visit_conditions_condition ON visit_conditions(condition);
         """)
 
+        # Databases created before boost_score became a generated column still
+        # store it as a plain REAL; rebuild the table so it's derived from the counts
+        boost_col = conn.execute(
+            "SELECT hidden FROM pragma_table_xinfo('keyword_boost') WHERE name = 'boost_score'"
+        ).fetchone()
+        if boost_col["hidden"] == 0:
+            conn.executescript("""
+                BEGIN;
+                ALTER TABLE keyword_boost RENAME TO keyword_boost_old;
+                CREATE TABLE keyword_boost (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    keyword TEXT UNIQUE NOT NULL,
+                    positive_count INTEGER DEFAULT 0,
+                    negative_count INTEGER DEFAULT 0,
+                    boost_score REAL GENERATED ALWAYS AS (
+                        CAST(positive_count AS REAL) / MAX(positive_count + negative_count, 1)
+                    ) STORED,
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                INSERT INTO keyword_boost (id, keyword, positive_count, negative_count, last_updated)
+                    SELECT id, keyword, positive_count, negative_count, last_updated FROM keyword_boost_old;
+                DROP TABLE keyword_boost_old;
+                COMMIT;
+            """)
+        # Serves get_boosted_keywords' ORDER BY straight from the index
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_keyword_boost_score "
+            "ON keyword_boost(boost_score DESC, positive_count DESC)"
+        )
+
         # Create FTS5 virtual table for full-text search
         conn.execute("""
             CREATE VIRTUAL TABLE IF NOT EXISTS visits_fts USING fts5(
@@ -76,12 +326,8 @@ def init_db() -> None:
         """)
 
         # Create triggers to keep FTS in sync
+        conn.execute(_FTS_INSERT_TRIGGER)
         conn.executescript("""
-            CREATE TRIGGER IF NOT EXISTS visits_ai AFTER INSERT ON visits BEGIN
-                INSERT INTO visits_fts(rowid, raw_transcript, tags)
-                VALUES (new.id, new.raw_transcript, new.tags);
-            END;
-
             CREATE TRIGGER IF NOT EXISTS visits_ad AFTER DELETE ON visits BEGIN
                 INSERT INTO visits_fts(visits_fts, rowid, raw_transcript, tags)
                 VALUES ('delete', old.id, old.raw_transcript, old.tags);
@@ -93,11 +339,39 @@ def init_db() -> None:
                 INSERT INTO visits_fts(rowid, raw_transcript, tags)
                 VALUES (new.id, new.raw_transcript, new.tags);
             END;
+
+            CREATE TRIGGER IF NOT EXISTS visit_tags_ai AFTER INSERT ON visits BEGIN
+                INSERT OR IGNORE INTO visit_tags(tag, visit_id)
+                SELECT value, new.id FROM json_each(new.tags);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS visit_tags_au AFTER UPDATE OF tags ON visits BEGIN
+                DELETE FROM visit_tags WHERE visit_id = old.id;
+                INSERT OR IGNORE INTO visit_tags(tag, visit_id)
+                SELECT value, new.id FROM json_each(new.tags);
+            END;
         """)
 
+        # Backfill databases created before visit_tags existed
+        if conn.execute("SELECT 1 FROM visit_tags LIMIT 1").fetchone() is None:
+            conn.execute("""
+                INSERT OR IGNORE INTO visit_tags(tag, visit_id)
+                SELECT j.value, v.id FROM visits v, json_each(v.tags) j
+            """)
+        if conn.execute("SELECT 1 FROM visit_conditions LIMIT 1").fetchone() is None:
+            findings = conn.execute(
+                """SELECT v.id, j.value FROM visits v,
+                          json_each(v.clinician_note_json, '$.soap_note.assessment.findings') j
+                   WHERE json_valid(v.clinician_note_json)"""
+            ).fetchall()
+            conn.executemany(
+                "INSERT INTO visit_conditions (visit_id, condition) VALUES (?, ?)",
+                [(vid, c) for vid, f in findings for c in _clean_condition(f)],
+            )
+
         conn.commit()
-    finally:
-        conn.close()
+        # Gather planner stats for any new or changed indexes
+        conn.execute("PRAGMA optimize")
 
 
 def _serialize_optional(obj) -> Optional[str]:
@@ -107,43 +381,172 @@ def _serialize_optional(obj) -> Optional[str]:
     return obj.model_dump_json()
 
 
-def _serialize_list(items: list) -> str:
-    """Serialize a list of Pydantic models to JSON string."""
-    return json.dumps([item.model_dump() for item in items])
+# Large list columns (trials, literature, segments) are stored as a version
+# byte + zlib-compressed JSON BLOB; small ones stay plain JSON TEXT. Readers
+# accept both, so rows written before compression still load.
+_COMPRESS_MIN_BYTES = 1024
+_ZLIB_JSON_V1 = b"\x01"
+
+
+# Serializers for the list columns, built once instead of walking each item
+# through model_dump() on every save
+_TRIALS_ADAPTER = TypeAdapter(list[ClinicalTrial])
+_LITERATURE_ADAPTER = TypeAdapter(list[LiteratureResult])
+_SEGMENTS_ADAPTER = TypeAdapter(list[TranscriptSegment])
+
+
+def _serialize_list(adapter: TypeAdapter, items: list) -> str | bytes:
+    """Serialize a list of Pydantic models to JSON, compressing large payloads."""
+    data = adapter.dump_json(items)
+    if len(data) < _COMPRESS_MIN_BYTES:
+        return data.decode()
+    return _ZLIB_JSON_V1 + zlib.compress(data, 1)
+
+
+def _deserialize_list(raw: str | bytes | None) -> list:
+    """Parse a list column written by _serialize_list."""
+    if not raw:
+        return []
+    if isinstance(raw, bytes) and raw[:1] == _ZLIB_JSON_V1:
+        raw = zlib.decompress(raw[1:])
+    return orjson.loads(raw)
+
+
+# Per-model map of field name -> (nested model class, is_list), built lazily
+_NESTED_FIELDS: dict[type, dict[str, tuple[type, bool]]] = {}
+
+
+def _nested_fields(cls: type[BaseModel]) -> dict[str, tuple[type, bool]]:
+    """Return the fields of cls that hold a model or a list of models."""
+    plan = _NESTED_FIELDS.get(cls)
+    if plan is None:
+        plan = {}
+        for name, field in cls.model_fields.items():
+            ann = field.annotation
+            is_list = get_origin(ann) is list
+            if is_list or get_origin(ann) in (Union, UnionType):
+                args = [a for a in get_args(ann) if a is not type(None)]
+                ann = args[0] if len(args) == 1 else None
+            if isinstance(ann, type) and issubclass(ann, BaseModel):
+                plan[name] = (ann, is_list)
+        _NESTED_FIELDS[cls] = plan
+    return plan
+
+
+def _construct(cls: type[BaseModel], data: dict) -> BaseModel:
+    """Build cls from stored JSON without validation, recursing into nested models.
+
+    Only for rows this module wrote itself: everything stored was already
+    validated on the way in. Ingress (LLM output, API input) must keep
+    using model_validate.
+    """
+    for name, (sub, is_list) in _nested_fields(cls).items():
+        value = data.get(name)
+        if value is None:
+            continue
+        data[name] = [_construct(sub, v) for v in value] if is_list else _construct(sub, value)
+    return cls.model_construct(**data)
+
+
+def _load_list(cls: type[BaseModel], raw: str | bytes | None) -> list:
+    """Rebuild a stored JSON list of cls models."""
+    return [_construct(cls, item) for item in _deserialize_list(raw)]
+
+
+def _store_conditions(conn: sqlite3.Connection, visit_id: int, clinician_note: Optional[ClinicianNote]) -> None:
+    """Replace a visit's cleaned assessment conditions (caller commits)."""
+    conn.execute("DELETE FROM visit_conditions WHERE visit_id = ?", (visit_id,))
+    if clinician_note is None:
+        return
+    conn.executemany(
+        "INSERT INTO visit_conditions (visit_id, condition) VALUES (?, ?)",
+        [
+            (visit_id, c)
+            for f in clinician_note.soap_note.assessment.findings
+            for c in _clean_condition(f)
+        ],
+    )
+
+
+def _insert_visit(conn: sqlite3.Connection, visit: VisitRecord) -> int:
+    """Insert one visit (and its conditions) on conn and return its ID; caller commits."""
+    visit_id = conn.execute(
+        """INSERT INTO visits (
+            visit_date, visit_type, tags, audio_duration_seconds,
+            raw_transcript, patient_summary_json, clinician_note_json,
+            clinical_trials_json,
+            literature_results_json, transcript_segments_json
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        RETURNING id""",
+        (
+            visit.visit_date.isoformat() if visit.visit_date else None,
+            visit.visit_type,
+            orjson.dumps(visit.tags).decode(),
+            visit.audio_duration_seconds,
+            visit.raw_transcript,
+            _serialize_optional(visit.patient_summary),
+            _serialize_optional(visit.clinician_note),
+            _serialize_list(_TRIALS_ADAPTER, visit.clinical_trials),
+            _serialize_list(_LITERATURE_ADAPTER, visit.literature_results),
+            _serialize_list(_SEGMENTS_ADAPTER, visit.transcript_segments),
+        )
+    ).fetchone()[0]
+    _store_conditions(conn, visit_id, visit.clinician_note)
+    return visit_id
 
 
 def save_visit(visit: VisitRecord) -> int:
     """Save a visit record and return its ID."""
-    conn = _get_connection()
-    try:
-        cursor = conn.execute(
-            """INSERT INTO visits (
-                visit_date, visit_type, tags, audio_duration_seconds,
-                raw_transcript, patient_summary_json, clinician_note_json,
-                clinical_trials_json,
-                literature_results_json, transcript_segments_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                visit.visit_date.isoformat() if visit.visit_date else None,
-                visit.visit_type,
-                json.dumps(visit.tags),
-                visit.audio_duration_seconds,
-                visit.raw_transcript,
-                _serialize_optional(visit.patient_summary),
-                _serialize_optional(visit.clinician_note),
-                _serialize_list(visit.clinical_trials),
-                _serialize_list(visit.literature_results),
-                _serialize_list(visit.transcript_segments),
-            )
-        )
+    with _writer() as conn:
+        visit_id = _insert_visit(conn, visit)
         conn.commit()
-        return cursor.lastrowid
-    finally:
-        conn.close()
+    _bump_write_version()
+    return visit_id
 
 
-def _row_to_visit(row: sqlite3.Row) -> VisitRecord:
-    """Convert a database row to a VisitRecord."""
+def save_visits_bulk(visits: list[VisitRecord]) -> list[int]:
+    """Save many visits in one transaction and return their IDs in order.
+
+    One commit (and one WAL sync) for the whole batch instead of one per visit.
+    """
+    with _writer() as conn:
+        visit_ids = [_insert_visit(conn, visit) for visit in visits]
+        conn.commit()
+    _bump_write_version()
+    return visit_ids
+
+
+def bulk_load_visits(visits: list[VisitRecord]) -> list[int]:
+    """Import many visits with deferred full-text indexing; returns their IDs.
+
+    Drops the per-row FTS insert trigger, inserts everything in one
+    transaction, then rebuilds visits_fts in a single pass and restores the
+    trigger. The rebuild re-indexes every visit, so this pays off for large
+    (re)imports; use save_visits_bulk for ordinary batches. Tags and
+    conditions are still maintained per row.
+    """
+    with _writer() as conn:
+        # Explicit BEGIN so the trigger DDL is part of the transaction and an
+        # error rolls everything back, trigger included
+        conn.execute("BEGIN")
+        conn.execute("DROP TRIGGER IF EXISTS visits_ai")
+        visit_ids = [_insert_visit(conn, visit) for visit in visits]
+        conn.execute("INSERT INTO visits_fts(visits_fts) VALUES ('rebuild')")
+        conn.execute(_FTS_INSERT_TRIGGER)
+        conn.commit()
+    _bump_write_version()
+    return visit_ids
+
+
+# Columns needed for a VisitSummary; skips the large trial/literature/segment JSON
+_SUMMARY_COLUMNS = ", ".join(f"v.{c}" for c in (
+    "id", "created_at", "visit_date", "visit_type", "tags", "audio_duration_seconds",
+    "raw_transcript", "patient_summary_json", "clinician_note_json",
+))
+
+
+def _row_to_visit(row: sqlite3.Row, light: bool = False) -> VisitRecord | VisitSummary:
+    """Convert a database row to a VisitRecord, or a VisitSummary when light."""
     visit_date = None
     if row["visit_date"]:
         try:
@@ -158,34 +561,37 @@ def _row_to_visit(row: sqlite3.Row) -> VisitRecord:
         except (ValueError, TypeError):
             pass
 
-    return VisitRecord(
+    # Rows were validated when saved, so rebuild them without re-validating
+    fields = dict(
         id=row["id"],
         created_at=created_at,
         visit_date=visit_date,
         visit_type=row["visit_type"] or "",
-        tags=json.loads(row["tags"]) if row["tags"] else [],
+        tags=orjson.loads(row["tags"]) if row["tags"] else [],
         audio_duration_seconds=row["audio_duration_seconds"] or 0.0,
         raw_transcript=row["raw_transcript"] or "",
-        patient_summary=PatientSummary.model_validate_json(row["patient_summary_json"])
+        patient_summary=_construct(PatientSummary, orjson.loads(row["patient_summary_json"]))
             if row["patient_summary_json"] else None,
-        clinician_note=ClinicianNote.model_validate_json(row["clinician_note_json"])
+        clinician_note=_construct(ClinicianNote, orjson.loads(row["clinician_note_json"]))
             if row["clinician_note_json"] else None,
-        clinical_trials=[ClinicalTrial.model_validate(t) for t in json.loads(row["clinical_trials_json"] or "[]")],
-        literature_results=[LiteratureResult.model_validate(r) for r in json.loads(row["literature_results_json"] or "[]")],
-        transcript_segments=[TranscriptSegment.model_validate(s) for s in json.loads(row["transcript_segments_json"] or "[]")],
+    )
+    if light:
+        return VisitSummary.model_construct(**fields)
+    return VisitRecord.model_construct(
+        **fields,
+        clinical_trials=_load_list(ClinicalTrial, row["clinical_trials_json"]),
+        literature_results=_load_list(LiteratureResult, row["literature_results_json"]),
+        transcript_segments=_load_list(TranscriptSegment, row["transcript_segments_json"]),
     )
 
 
 def get_visit(visit_id: int) -> Optional[VisitRecord]:
     """Get a single visit by ID."""
-    conn = _get_connection()
-    try:
+    with _reader() as conn:
         row = conn.execute("SELECT * FROM visits WHERE id = ?", (visit_id,)).fetchone()
         if row is None:
             return None
         return _row_to_visit(row)
-    finally:
-        conn.close()
 
 
 def get_all_visits(
@@ -194,37 +600,46 @@ def get_all_visits(
     sort: str = "date",
     limit: int = 50,
     offset: int = 0,
-) -> list[VisitRecord]:
-    """Get all visits with optional search, tag filter, and sorting."""
-    conn = _get_connection()
-    try:
+    light: bool = False,
+) -> list[VisitRecord] | list[VisitSummary]:
+    """Get all visits with optional search, tag filter, and sorting.
+
+    With light=True, returns VisitSummary entries and never reads or decodes
+    the trial, literature, and segment columns.
+    """
+    cols = _SUMMARY_COLUMNS if light else "v.*"
+    with _reader() as conn:
         if search:
-            # Use FTS5 for full-text search
-            rows = conn.execute(
-                """SELECT v.* FROM visits v
-                   JOIN visits_fts fts ON v.id = fts.rowid
-                   WHERE visits_fts MATCH ?
+            # Use FTS5 for full-text search. Materializing the MATCH first pins
+            # the plan to the FTS index; otherwise the planner may walk visits
+            # by created_at and probe the FTS table row by row.
+            cursor = conn.execute(
+                f"""WITH m AS MATERIALIZED (
+                       SELECT rowid FROM visits_fts WHERE visits_fts MATCH ?
+                   )
+                   SELECT {cols} FROM visits v
+                   JOIN m ON v.id = m.rowid
                    ORDER BY v.created_at DESC
                    LIMIT ? OFFSET ?""",
                 (search, limit, offset)
-            ).fetchall()
+            )
         elif tag:
-            rows = conn.execute(
-                """SELECT * FROM visits
-                   WHERE tags LIKE ?
-                   ORDER BY created_at DESC
+            cursor = conn.execute(
+                f"""SELECT {cols} FROM visit_tags vt
+                   JOIN visits v ON v.id = vt.visit_id
+                   WHERE vt.tag = ?
+                   ORDER BY v.created_at DESC
                    LIMIT ? OFFSET ?""",
-                (f'%"{tag}"%', limit, offset)
-            ).fetchall()
+                (tag, limit, offset)
+            )
         else:
             order = "created_at DESC" if sort == "date" else "id DESC"
-            rows = conn.execute(
-                f"SELECT * FROM visits ORDER BY {order} LIMIT ? OFFSET ?",
+            cursor = conn.execute(
+                f"SELECT {cols} FROM visits v ORDER BY {order} LIMIT ? OFFSET ?",
                 (limit, offset)
-            ).fetchall()
-        return [_row_to_visit(row) for row in rows]
-    finally:
-        conn.close()
+            )
+        # Build models straight off the cursor rather than fetchall() + a second list
+        return [_row_to_visit(row, light) for row in cursor]
 
 
 def search_visits(query: str) -> list[VisitRecord]:
@@ -234,69 +649,77 @@ def search_visits(query: str) -> list[VisitRecord]:
 
 def delete_visit(visit_id: int) -> bool:
     """Delete a visit by ID. Returns True if deleted."""
-    conn = _get_connection()
-    try:
+    with _writer() as conn:
         cursor = conn.execute("DELETE FROM visits WHERE id = ?", (visit_id,))
         conn.commit()
-        return cursor.rowcount > 0
-    finally:
-        conn.close()
+    _bump_write_version()
+    return cursor.rowcount > 0
 
 
 def update_clinician_note(visit_id: int, clinician_note: ClinicianNote) -> bool:
     """Update the clinician note (SOAP) for a visit. Returns True if updated."""
-    conn = _get_connection()
-    try:
+    with _writer() as conn:
         cursor = conn.execute(
             "UPDATE visits SET clinician_note_json = ? WHERE id = ?",
-            (json.dumps(clinician_note.model_dump()), visit_id),
+            (clinician_note.model_dump_json(), visit_id),
         )
+        if cursor.rowcount == 0:
+            return False
+        _store_conditions(conn, visit_id, clinician_note)
         conn.commit()
-        return cursor.rowcount > 0
-    finally:
-        conn.close()
+    _bump_write_version()
+    return True
 
 
 def update_patient_summary(visit_id: int, patient_summary: PatientSummary) -> bool:
     """Update the patient summary for a visit. Returns True if updated."""
-    conn = _get_connection()
-    try:
+    with _writer() as conn:
         cursor = conn.execute(
             "UPDATE visits SET patient_summary_json = ? WHERE id = ?",
-            (json.dumps(patient_summary.model_dump()), visit_id),
+            (patient_summary.model_dump_json(), visit_id),
+        )
+        conn.commit()
+    _bump_write_version()
+    return cursor.rowcount > 0
+
+
+def update_literature_results(visit_id: int, literature_results: list[LiteratureResult]) -> bool:
+    """Replace the cached literature results for a visit. Returns True if updated."""
+    with _writer() as conn:
+        cursor = conn.execute(
+            "UPDATE visits SET literature_results_json = ? WHERE id = ?",
+            (_serialize_list(_LITERATURE_ADAPTER, literature_results), visit_id),
         )
         conn.commit()
-        return cursor.rowcount > 0
-    finally:
-        conn.close()
+    _bump_write_version()
+    return cursor.rowcount > 0
 
 
 def save_feedback(feedback: FeedbackItem) -> int:
     """Save a feedback entry and return its ID."""
-    conn = _get_connection()
-    try:
+    with _writer() as conn:
         cursor = conn.execute(
             """INSERT INTO feedback (visit_id, feedback_type, item_type, item_value, rating, paper_url, clinician_note)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               RETURNING id""",
             (feedback.visit_id, feedback.feedback_type, feedback.item_type,
              feedback.item_value, feedback.rating, feedback.paper_url, feedback.clinician_note)
         )
+        feedback_id = cursor.fetchone()[0]
         conn.commit()
-        return cursor.lastrowid
-    finally:
-        conn.close()
+    _bump_write_version()
+    return feedback_id
 
 
 def get_feedback(visit_id: int) -> list[FeedbackItem]:
     """Get all feedback for a visit."""
-    conn = _get_connection()
-    try:
+    with _reader() as conn:
         rows = conn.execute(
             "SELECT * FROM feedback WHERE visit_id = ? ORDER BY created_at DESC",
             (visit_id,)
         ).fetchall()
         return [
-            FeedbackItem(
+            FeedbackItem.model_construct(
                 feedback_id=row["id"],
                 visit_id=row["visit_id"],
                 feedback_type=row["feedback_type"],
@@ -309,56 +732,37 @@ def get_feedback(visit_id: int) -> list[FeedbackItem]:
             )
             for row in rows
         ]
-    finally:
-        conn.close()
 
 
 def update_keyword_boost(keywords: list[str], positive: bool) -> None:
     """Update keyword boost scores based on feedback."""
-    conn = _get_connection()
-    try:
-        for keyword in keywords:
-            keyword = keyword.lower().strip()
-            if len(keyword) < 3:
-                continue
-            existing = conn.execute(
-                "SELECT * FROM keyword_boost WHERE keyword = ?", (keyword,)
-            ).fetchone()
-            if existing:
-                if positive:
-                    conn.execute(
-                        """UPDATE keyword_boost SET positive_count = positive_count + 1,
-                           boost_score = CAST(positive_count + 1 AS REAL) / (positive_count + 1 + negative_count),
-                           last_updated = CURRENT_TIMESTAMP
-                           WHERE keyword = ?""",
-                        (keyword,)
-                    )
-                else:
-                    conn.execute(
-                        """UPDATE keyword_boost SET negative_count = negative_count + 1,
-                           boost_score = CAST(positive_count AS REAL) / (positive_count + negative_count + 1),
-                           last_updated = CURRENT_TIMESTAMP
-                           WHERE keyword = ?""",
-                        (keyword,)
-                    )
-            else:
-                pos = 1 if positive else 0
-                neg = 0 if positive else 1
-                score = pos / (pos + neg)
-                conn.execute(
-                    """INSERT INTO keyword_boost (keyword, positive_count, negative_count, boost_score)
-                       VALUES (?, ?, ?, ?)""",
-                    (keyword, pos, neg, score)
-                )
+    pos, neg = (1, 0) if positive else (0, 1)
+    rows = [
+        (keyword, pos, neg)
+        for keyword in (k.lower().strip() for k in keywords)
+        if len(keyword) >= 3
+    ]
+    if not rows:
+        return
+    with _writer() as conn:
+        # One upsert per keyword in a single transaction; boost_score is a
+        # generated column, so only the counts are written
+        conn.executemany(
+            """INSERT INTO keyword_boost (keyword, positive_count, negative_count)
+               VALUES (?, ?, ?)
+               ON CONFLICT(keyword) DO UPDATE SET
+                   positive_count = positive_count + excluded.positive_count,
+                   negative_count = negative_count + excluded.negative_count,
+                   last_updated = CURRENT_TIMESTAMP""",
+            rows,
+        )
         conn.commit()
-    finally:
-        conn.close()
+    _bump_write_version()
 
 
 def get_boosted_keywords(min_score: float = 0.0) -> list[BoostedKeyword]:
     """Get keywords with boost scores, ordered by score descending."""
-    conn = _get_connection()
-    try:
+    with _reader() as conn:
         rows = conn.execute(
             """SELECT * FROM keyword_boost
                WHERE boost_score >= ?
@@ -367,7 +771,7 @@ def get_boosted_keywords(min_score: float = 0.0) -> list[BoostedKeyword]:
             (min_score,)
         ).fetchall()
         return [
-            BoostedKeyword(
+            BoostedKeyword.model_construct(
                 keyword=row["keyword"],
                 positive_count=row["positive_count"],
                 negative_count=row["negative_count"],
@@ -375,52 +779,39 @@ def get_boosted_keywords(min_score: float = 0.0) -> list[BoostedKeyword]:
             )
             for row in rows
         ]
-    finally:
-        conn.close()
 
 
+@_cached_until_write
 def get_feedback_analytics() -> FeedbackAnalytics:
     """Compute aggregated feedback analytics."""
-    conn = _get_connection()
-    try:
-        # Total feedback count
-        total = conn.execute("SELECT COUNT(*) as cnt FROM feedback").fetchone()["cnt"]
-
-        # Extraction accuracy rate
-        extraction_rows = conn.execute(
-            """SELECT rating, COUNT(*) as cnt FROM feedback
-               WHERE feedback_type = 'extraction_accuracy'
-               GROUP BY rating"""
+    with _reader() as conn:
+        # One grouped pass over feedback; everything else is summed from ~dozens of rows
+        counts = conn.execute(
+            """SELECT feedback_type, item_type, rating, COUNT(*) as cnt FROM feedback
+               GROUP BY feedback_type, item_type, rating"""
         ).fetchall()
-        extraction_total = sum(r["cnt"] for r in extraction_rows)
-        extraction_correct = sum(r["cnt"] for r in extraction_rows if r["rating"] == "correct")
-        extraction_accuracy = extraction_correct / extraction_total if extraction_total > 0 else 0.0
 
-        # Accuracy by item type
-        accuracy_by_type = {}
-        item_types = conn.execute(
-            "SELECT DISTINCT item_type FROM feedback WHERE feedback_type = 'extraction_accuracy'"
-        ).fetchall()
-        for it in item_types:
-            itype = it["item_type"]
-            type_rows = conn.execute(
-                """SELECT rating, COUNT(*) as cnt FROM feedback
-                   WHERE feedback_type = 'extraction_accuracy' AND item_type = ?
-                   GROUP BY rating""",
-                (itype,)
-            ).fetchall()
-            type_total = sum(r["cnt"] for r in type_rows)
-            type_correct = sum(r["cnt"] for r in type_rows if r["rating"] == "correct")
-            accuracy_by_type[itype] = type_correct / type_total if type_total > 0 else 0.0
+        total = 0
+        extraction_total = extraction_correct = 0
+        lit_total = lit_relevant = 0
+        type_counts: dict[str, list[int]] = {}  # item_type -> [correct, total]
+        for r in counts:
+            cnt = r["cnt"]
+            total += cnt
+            if r["feedback_type"] == "extraction_accuracy":
+                correct = cnt if r["rating"] == "correct" else 0
+                extraction_total += cnt
+                extraction_correct += correct
+                tc = type_counts.setdefault(r["item_type"], [0, 0])
+                tc[0] += correct
+                tc[1] += cnt
+            elif r["feedback_type"] == "literature_relevance":
+                lit_total += cnt
+                if r["rating"] == "relevant":
+                    lit_relevant += cnt
 
-        # Literature relevance rate
-        lit_rows = conn.execute(
-            """SELECT rating, COUNT(*) as cnt FROM feedback
-               WHERE feedback_type = 'literature_relevance'
-               GROUP BY rating"""
-        ).fetchall()
-        lit_total = sum(r["cnt"] for r in lit_rows)
-        lit_relevant = sum(r["cnt"] for r in lit_rows if r["rating"] == "relevant")
+        extraction_accuracy = extraction_correct / extraction_total if extraction_total > 0 else 0.0
+        accuracy_by_type = {itype: correct / n for itype, (correct, n) in type_counts.items()}
         lit_rate = lit_relevant / lit_total if lit_total > 0 else 0.0
 
         # Most relevant papers
@@ -451,69 +842,63 @@ def get_feedback_analytics() -> FeedbackAnalytics:
             ],
             most_useful_keywords=[r["keyword"] for r in top_kw],
         )
-    finally:
-        conn.close()
 
 
 
+# Compiled once; _clean_condition runs for every assessment finding in get_analytics
+_CONDITION_SKIP_RE = re.compile(
+    r'differential diagnosis|clinical impression|clinical reasoning'
+    r'|none mentioned|not mentioned|no .* mentioned'
+    r'|if mentioned|the patient|patient.s symptoms',
+    re.IGNORECASE,
+)
+_CONDITION_PREFIX_RE = re.compile(
+    r'(patient (presents with|has|had|is|was|reports?|complains? of|experiencing)'
+    r'|symptoms? (suggestive|indicative) of|possible|probable|likely|suspected'
+    r'|consistent with|concerning for|history of|evidence of|assessment:?|findings?:?)',
+    re.IGNORECASE,
+)
+_CONDITION_SPLIT_RE = re.compile(r'[,;]\s*|\s+including\s+|\s+such as\s+|\s+and\s+')
+_CONDITION_LEAD_RE = re.compile(r'^(including|such as|like|with)\s+', re.IGNORECASE)
+
+
 def _clean_condition(raw: str) -> list[str]:
     """Clean verbose assessment findings into short condition names."""
     if not raw or len(raw) < 3:
         return []
     # Skip junk entries entirely
-    skip_patterns = [
-        r'(?i)differential diagnosis', r'(?i)clinical impression', r'(?i)clinical reasoning',
-        r'(?i)none mentioned', r'(?i)not mentioned', r'(?i)no .* mentioned',
-        r'(?i)if mentioned', r'(?i)the patient', r'(?i)patient.s symptoms',
-    ]
-    for pat in skip_patterns:
-        if re.search(pat, raw):
-            return []
+    if _CONDITION_SKIP_RE.search(raw):
+        return []
     # Remove verbose prefixes
-    cleaned = re.sub(r'(?i)(patient (presents with|has|had|is|was|reports?|complains? of|experiencing)|symptoms? (suggestive|indicative) of|possible|probable|likely|suspected|consistent with|concerning for|history of|evidence of|assessment:?|findings?:?)', '', raw)
+    cleaned = _CONDITION_PREFIX_RE.sub('', raw)
     # Split on commas, semicolons, 'including', 'such as', 'and'
-    parts = re.split(r'[,;]\s*|\s+including\s+|\s+such as\s+|\s+and\s+', cleaned)
+    parts = _CONDITION_SPLIT_RE.split(cleaned)
     results = []
     for p in parts:
-        p = re.sub(r'(?i)^(including|such as|like|with)\s+', '', p.strip().strip('.').strip(':').strip())
+        p = _CONDITION_LEAD_RE.sub('', p.strip().strip('.').strip(':').strip())
         # Must be short, no colons (skip template text), and meaningful
         if 3 < len(p) < 50 and ':' not in p:
             results.append(p.lower())
     return results
 
+@_cached_until_write
 def get_analytics() -> AnalyticsSummary:
     """Compute dashboard analytics from all visits."""
-    conn = _get_connection()
-    try:
+    with _reader() as conn:
         total = conn.execute("SELECT COUNT(*) as cnt FROM visits").fetchone()["cnt"]
 
-        all_conditions = []
-        all_medications = []
-
-        # Extract conditions and medications from clinician notes
-        cn_rows = conn.execute("SELECT clinician_note_json FROM visits WHERE clinician_note_json IS NOT NULL").fetchall()
-        for row in cn_rows:
-            try:
-                cn = json.loads(row["clinician_note_json"])
-                soap = cn.get("soap_note", {})
-                assessment = soap.get("assessment", {})
-                for f in assessment.get("findings", []):
-                    all_conditions.extend(_clean_condition(f))
-                plan = soap.get("plan", {})
-                all_medications.extend(plan.get("findings", []))
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        # Count conditions and medications
-        cond_counts = {}
-        for c in all_conditions:
-            cond_counts[c] = cond_counts.get(c, 0) + 1
-        med_counts = {}
-        for m in all_medications:
-            med_counts[m] = med_counts.get(m, 0) + 1
-
-        top_conditions = sorted(cond_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        top_medications = sorted(med_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Conditions are cleaned at write time into visit_conditions
+        top_conditions = conn.execute(
+            """SELECT condition, COUNT(*) as cnt FROM visit_conditions
+               GROUP BY condition ORDER BY cnt DESC, condition LIMIT 10"""
+        ).fetchall()
+        # Plan findings are counted straight out of the stored note JSON
+        top_medications = conn.execute(
+            """SELECT j.value as medication, COUNT(*) as cnt
+               FROM visits v, json_each(v.clinician_note_json, '$.soap_note.plan.findings') j
+               WHERE json_valid(v.clinician_note_json)
+               GROUP BY j.value ORDER BY cnt DESC, j.value LIMIT 10"""
+        ).fetchall()
 
         # Visits over time (by month)
         time_rows = conn.execute(
@@ -532,8 +917,8 @@ def get_analytics() -> AnalyticsSummary:
         return AnalyticsSummary(
             total_visits=total,
             risk_distribution={"low": 0, "medium": 0, "high": 0},
-            top_conditions=[{"condition": c, "count": n} for c, n in top_conditions],
-            top_medications=[{"medication": m, "count": n} for m, n in top_medications],
+            top_conditions=[{"condition": r["condition"], "count": r["cnt"]} for r in top_conditions],
+            top_medications=[{"medication": r["medication"], "count": r["cnt"]} for r in top_medications],
             red_flag_frequency={},
             visits_over_time=[{"date": r["month"], "count": r["cnt"]} for r in time_rows],
             avg_risk_score=0.0,
@@ -541,5 +926,3 @@ def get_analytics() -> AnalyticsSummary:
             literature_relevance_rate=fb.literature_relevance_rate,
             top_boosted_keywords=top_kw,
         )
-    finally:
-        conn.close()
@@ -1,10 +1,27 @@
 """Pydantic models for all MedSift AI data structures."""
 
 from datetime import datetime, date
-from typing import Literal, Optional
+from types import UnionType
+from typing import Any, Callable, ClassVar, Literal, Optional, Union, get_args, get_origin
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 
+def _null_default(annotation) -> Optional[Callable[[], Any]]:
+    """Factory for the value a null should become for this annotation, if any."""
+    if annotation is str:
+        return str
+    origin = get_origin(annotation)
+    if origin in (Union, UnionType):
+        origins = {get_origin(arg) or arg for arg in get_args(annotation)}
+    else:
+        origins = {origin or annotation}
+    if list in origins:
+        return list
+    if dict in origins:
+        return dict
+    return None
+
+
 class NullSafeModel(BaseModel):
     """Base model that coerces None values to defaults for str and list fields.
 
@@ -12,20 +29,25 @@ class NullSafeModel(BaseModel):
     validation doesn't fail on those cases.
     """
 
+    # field name -> factory for its null replacement, computed once per class
+    __null_defaults__: ClassVar[dict[str, Callable[[], Any]]] = {}
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__null_defaults__ = {
+            name: factory
+            for name, field_info in cls.model_fields.items()
+            if (factory := _null_default(field_info.annotation)) is not None
+        }
+
     @model_validator(mode="before")
     @classmethod
     def coerce_nulls(cls, data):
         if isinstance(data, dict):
-            for field_name, field_info in cls.model_fields.items():
+            for field_name, factory in cls.__null_defaults__.items():
                 if field_name in data and data[field_name] is None:
-                    annotation = field_info.annotation
-                    ann_str = str(annotation)
-                    if annotation is str or annotation == str:
-                        data[field_name] = ""
-                    elif "list" in ann_str.lower():
-                        data[field_name] = []
-                    elif "dict" in ann_str.lower():
-                        data[field_name] = {}
+                    data[field_name] = factory()
         return data
 
 
@@ -250,8 +272,8 @@ class FeedbackAnalytics(BaseModel):
 
 # --- Visit Record ---
 
-class VisitRecord(BaseModel):
-    """Complete visit record stored in database."""
+class VisitSummary(BaseModel):
+    """Visit list entry: a visit without its trial, literature, and segment payloads."""
     id: Optional[int] = None
     created_at: Optional[datetime] = None
     visit_date: Optional[date] = None
@@ -261,6 +283,10 @@ class VisitRecord(BaseModel):
     raw_transcript: str = ""
     patient_summary: Optional[PatientSummary] = None
     clinician_note: Optional[ClinicianNote] = None
+
+
+class VisitRecord(VisitSummary):
+    """Complete visit record stored in database."""
     clinical_trials: list[ClinicalTrial] = []
     literature_results: list[LiteratureResult] = []
     transcript_segments: list[TranscriptSegment] = []
@@ -5,32 +5,107 @@ Run with: streamlit run streamlit_demo/app.py
 Requires FastAPI backend running on port 8000.
 """
 
-import json
+import asyncio
+import io
+import logging
+import httpx
+import orjson
 import requests
 import streamlit as st
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_BASE = "http://localhost:8000"
 
+logger = logging.getLogger(__name__)
+
+# Connect timeout for every backend call. Read timeouts are per call; the long
+# ones (transcribe/analyze) should not also mean a long wait on a down backend.
+_CONNECT_TIMEOUT = 5
+
+# Request bodies are encoded with orjson and sent as raw bytes
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_PRIORITY_ICON = {"high": "[HIGH]", "medium": "[MED]", "low": "[LOW]"}
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """One keep-alive session per process for every backend call.
+
+    Cached as a Streamlit resource so the connection pool survives script
+    reruns and hot reloads. Retries cover idempotent requests only. Don't
+    change its headers per request; pass headers= on the call instead.
+    """
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    ))
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+
+# The SOAP text-area helpers run for every text area on every rerun with the
+# same inputs, so both are memoized (module state survives reruns).
+@lru_cache(maxsize=256)
+def _join_bullets(items: tuple) -> str:
+    return "\n".join(items)
+
 
 def _bullets_to_text(items: list) -> str:
     """Convert a list of bullet strings to text (one per line)."""
-    return "\n".join(items) if items else ""
+    return _join_bullets(tuple(items)) if items else ""
+
 
+@lru_cache(maxsize=256)
+def _text_to_bullets(text: str) -> tuple:
+    """Convert text area content (one item per line) to a tuple of strings.
 
-def _text_to_bullets(text: str) -> list:
-    """Convert text area content (one item per line) to list of strings."""
-    if not text or not text.strip():
-        return []
-    return [line.lstrip("- ").strip() for line in text.strip().split("\n") if line.strip()]
+    Blank lines are dropped and a single leading "-" bullet marker is removed.
+    Returns a tuple because results are shared between callers via the cache.
+    """
+    if not text:
+        return ()
+    out = []
+    for line in text.splitlines():
+        item = line.strip()
+        if item[:1] == "-":
+            item = item[1:].lstrip()
+        if item:
+            out.append(item)
+    return tuple(out)
+
+
+@lru_cache(maxsize=512)
+def _format_authors(authors: tuple) -> str:
+    """First three author names, with "et al." when there are more."""
+    names = ", ".join(authors[:3])
+    return names + " et al." if len(authors) > 3 else names
+
+
+@st.cache_data(ttl=60, max_entries=128, show_spinner=False)
+def _cached_get(endpoint: str, params_key: tuple):
+    """GET and decode JSON; errors raise, so only successful responses are cached."""
+    r = get_http_session().get(
+        f"{API_BASE}{endpoint}", params=dict(params_key) or None, timeout=(_CONNECT_TIMEOUT, 30),
+    )
+    r.raise_for_status()
+    return orjson.loads(r.content)
 
 
 def api_get(endpoint: str, params: dict = None):
-    """Make a GET request to the FastAPI backend."""
+    """Make a GET request to the FastAPI backend.
+
+    Responses are cached for 60s so Streamlit reruns don't refetch; any
+    successful api_post/api_put or feedback post clears the cache.
+    """
     try:
-        r = requests.get(f"{API_BASE}{endpoint}", params=params, timeout=30)
-        r.raise_for_status()
-        return r.json()
+        return _cached_get(endpoint, tuple(sorted((params or {}).items())))
     except requests.ConnectionError:
         st.error("Cannot connect to API. Make sure FastAPI is running: `uvicorn app.main:app --reload --port 8000`")
         return None
@@ -39,15 +114,87 @@ def api_get(endpoint: str, params: dict = None):
         return None
 
 
+async def _get_all(endpoints: tuple[str, ...]) -> list:
+    """Issue GETs for all endpoints concurrently on one client."""
+    timeout = httpx.Timeout(30, connect=_CONNECT_TIMEOUT)
+    async with httpx.AsyncClient(base_url=API_BASE, timeout=timeout) as client:
+        return await asyncio.gather(
+            *(client.get(endpoint) for endpoint in endpoints),
+            return_exceptions=True,
+        )
+
+
+class _PartialFetch(Exception):
+    """Raised by _cached_get_all when any GET failed, so the batch isn't cached."""
+
+    def __init__(self, outcomes: list):
+        super().__init__("one or more GETs failed")
+        self.outcomes = outcomes
+
+
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def _cached_get_all(endpoints: tuple[str, ...]) -> list:
+    """Concurrent GETs, decoded. Only batches where every call succeeded are cached."""
+    outcomes = []
+    for resp in asyncio.run(_get_all(endpoints)):
+        try:
+            if isinstance(resp, Exception):
+                raise resp
+            resp.raise_for_status()
+            outcomes.append(orjson.loads(resp.content))
+        except Exception as e:
+            outcomes.append(e)
+    if any(isinstance(o, Exception) for o in outcomes):
+        raise _PartialFetch(outcomes)
+    return outcomes
+
+
+def api_get_parallel(*endpoints: str) -> list:
+    """GET several independent endpoints at once; failed ones come back as None.
+
+    Total latency is the slowest call rather than the sum of all of them.
+    Cached like api_get and cleared by the same writes.
+    """
+    try:
+        return _cached_get_all(endpoints)
+    except _PartialFetch as e:
+        outcomes = e.outcomes
+    results = []
+    for outcome in outcomes:
+        if isinstance(outcome, httpx.ConnectError):
+            st.error("Cannot connect to API. Make sure FastAPI is running: `uvicorn app.main:app --reload --port 8000`")
+            results.append(None)
+        elif isinstance(outcome, Exception):
+            st.error(f"API error: {outcome}")
+            results.append(None)
+        else:
+            results.append(outcome)
+    return results
+
+
+def _clear_get_caches() -> None:
+    """Drop cached GET responses after a write so the next render refetches."""
+    _cached_get.clear()
+    _cached_get_all.clear()
+
+
 def api_post(endpoint: str, data: dict = None, files: dict = None):
     """Make a POST request to the FastAPI backend."""
     try:
         if files:
-            r = requests.post(f"{API_BASE}{endpoint}", files=files, timeout=600)
+            r = get_http_session().post(
+                f"{API_BASE}{endpoint}", files=files, timeout=(_CONNECT_TIMEOUT, 600),
+            )
         else:
-            r = requests.post(f"{API_BASE}{endpoint}", json=data, timeout=600)
+            r = get_http_session().post(
+                f"{API_BASE}{endpoint}",
+                data=orjson.dumps(data),
+                headers=_JSON_HEADERS,
+                timeout=(_CONNECT_TIMEOUT, 600),
+            )
         r.raise_for_status()
-        return r.json()
+        _clear_get_caches()
+        return orjson.loads(r.content)
     except requests.ConnectionError:
         st.error("Cannot connect to API. Make sure FastAPI is running.")
         return None
@@ -62,9 +209,15 @@ def api_post(endpoint: str, data: dict = None, files: dict = None):
 def api_put(endpoint: str, data: dict = None):
     """Make a PUT request to the FastAPI backend."""
     try:
-        r = requests.put(f"{API_BASE}{endpoint}", json=data, timeout=30)
+        r = get_http_session().put(
+            f"{API_BASE}{endpoint}",
+            data=orjson.dumps(data),
+            headers=_JSON_HEADERS,
+            timeout=(_CONNECT_TIMEOUT, 30),
+        )
         r.raise_for_status()
-        return r.json()
+        _clear_get_caches()
+        return orjson.loads(r.content)
     except requests.ConnectionError:
         st.error("Cannot connect to API. Make sure FastAPI is running.")
         return None
@@ -76,6 +229,467 @@ def api_put(endpoint: str, data: dict = None):
         return None
 
 
+@st.cache_resource
+def _feedback_pool() -> ThreadPoolExecutor:
+    """Background workers for feedback posts, shared across reruns."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="feedback")
+
+
+def _post_feedback(payload: dict) -> None:
+    r = get_http_session().post(
+        f"{API_BASE}/api/feedback",
+        data=orjson.dumps(payload),
+        headers=_JSON_HEADERS,
+        timeout=(_CONNECT_TIMEOUT, 10),
+    )
+    r.raise_for_status()
+    _clear_get_caches()
+
+
+def _log_feedback_failure(future: Future) -> None:
+    if future.exception() is not None:
+        logger.warning(f"Feedback submission failed: {future.exception()}")
+
+
+def send_feedback_async(payload: dict) -> None:
+    """Submit feedback without blocking the script thread on the round-trip.
+
+    Feedback is best-effort: failures are logged rather than shown in the UI.
+    """
+    _feedback_pool().submit(_post_feedback, payload).add_done_callback(_log_feedback_failure)
+
+
+def _send_paper_feedback(visit_id: int, paper: dict, rating: str) -> None:
+    """Send a literature relevance rating for one paper.
+
+    The title is the feedback item because the server derives keyword
+    boosts from it; there is no paper lookup by id.
+    """
+    send_feedback_async({
+        "visit_id": visit_id,
+        "feedback_type": "literature_relevance",
+        "item_type": "paper",
+        "item_value": paper["title"],
+        "rating": rating,
+        "paper_url": paper.get("url") or None,
+    })
+
+
+def fetch_reviewed_pdf(visit_id: int, approved_summary: dict, include_soap: bool) -> io.BytesIO:
+    """POST an approved summary and stream the generated PDF into a buffer.
+
+    The body is copied in 64 KiB chunks rather than materialized through
+    r.content. Raises on connection or HTTP errors; callers report them.
+    """
+    buf = io.BytesIO()
+    with get_http_session().post(
+        f"{API_BASE}/api/export/reviewed/pdf",
+        data=orjson.dumps({
+            "visit_id": visit_id,
+            "approved_summary": approved_summary,
+            "include_soap": include_soap,
+        }),
+        headers=_JSON_HEADERS,
+        stream=True,
+        timeout=(_CONNECT_TIMEOUT, 30),
+    ) as r:
+        r.raise_for_status()
+        for chunk in r.iter_content(chunk_size=65536):
+            buf.write(chunk)
+    buf.seek(0)
+    return buf
+
+
+def _looks_like_audio(head: bytes) -> bool:
+    """Sniff the first bytes for the containers the uploader accepts (mp3/wav/m4a/webm)."""
+    return (
+        head[:3] == b"ID3"  # mp3 with an ID3 tag
+        or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0)  # bare mp3 frame
+        or (head[:4] == b"RIFF" and head[8:12] == b"WAVE")  # wav
+        or head[4:8] == b"ftyp"  # m4a / mp4
+        or head[:4] == b"\x1a\x45\xdf\xa3"  # webm (EBML)
+    )
+
+
+@lru_cache(maxsize=1)
+def _live_tab():
+    """Import the live transcription page on first use and keep the renderer."""
+    from live_transcribe_component import render_live_transcription_tab
+    return render_live_transcription_tab
+
+
+# --- Care Plan section markdown ---
+# Each Care Plan section is rendered as one markdown string (one element per
+# section instead of a markdown/caption call per line).
+_UNVERIFIED_NOTE = ":gray[Warning: _Could not verify against transcript_]"
+
+
+def _med_lines(med: dict) -> list:
+    lines = [f"**{med['name']}** {med['dose']} — {med['frequency']}"]
+    if med.get("instructions"):
+        lines.append(f":gray[Instructions: {med['instructions']}]")
+    if med.get("evidence"):
+        lines.append(f":gray[Evidence: _{med['evidence']}_]")
+    return lines
+
+
+def _test_lines(test: dict) -> list:
+    lines = [f"**{test['test_name']}** — {test['timeline']}"]
+    if test.get("evidence"):
+        lines.append(f":gray[Evidence: _{test['evidence']}_]")
+    return lines
+
+
+# section key -> (per-item line builder, separator between items)
+_CARE_PLAN_SECTIONS = {
+    "medications": (_med_lines, "\n\n"),
+    "tests_ordered": (_test_lines, "\n\n"),
+    "follow_up_plan": (lambda fu: [f"- [ ] **{fu['action']}** — {fu['date_or_timeline']}"], "\n"),
+    "lifestyle_recommendations": (lambda rec: [f"- **{rec['recommendation']}**: {rec.get('details', '')}"], "\n"),
+    "red_flags_for_patient": (lambda rf: [rf["warning"]], "\n\n"),
+    "questions_and_answers": (lambda qa: [f"**Q:** {qa['question']}", f"**A:** {qa['answer']}"], "\n\n---\n\n"),
+}
+
+
+@st.cache_data(show_spinner=False)
+def _render_section_markdown(section: str, items: tuple) -> str:
+    """Render one Care Plan section as a single markdown string.
+
+    Keyed on the item contents, so reruns over the same analysis reuse
+    the string.
+    """
+    line_builder, separator = _CARE_PLAN_SECTIONS[section]
+    blocks = []
+    for item in items:
+        lines = line_builder(item)
+        if not item.get("verified", True):
+            lines.append(_UNVERIFIED_NOTE)
+        blocks.append("  \n".join(lines))
+    return separator.join(blocks)
+
+
+# --- Upload & Process result tabs ---
+# Each tab is a fragment: a widget inside one tab reruns only that tab,
+# with the analysis it was last rendered from, instead of the whole page.
+
+@st.fragment
+def _render_care_plan(ps: dict):
+    """Care Plan tab: the patient letter and after-visit items."""
+    st.subheader("Patient Letter")
+    st.markdown(ps.get("visit_summary", "").replace("\n", "  \n"))
+
+    for section, title in (
+        ("medications", "Medications"),
+        ("tests_ordered", "Tests Ordered"),
+        ("follow_up_plan", "Follow-Up Plan"),
+        ("lifestyle_recommendations", "Lifestyle Recommendations"),
+        ("red_flags_for_patient", "When to Seek Urgent Care"),
+        ("questions_and_answers", "Questions & Answers"),
+    ):
+        items = ps.get(section)
+        if items:
+            st.subheader(title)
+            body = _render_section_markdown(section, tuple(items))
+            if section == "red_flags_for_patient":
+                st.warning(body)
+            else:
+                st.markdown(body)
+
+
+@st.fragment
+def _render_soap(cn: dict, vid: int | None):
+    """SOAP Note tab: editable SOAP sections and action items."""
+    soap = cn.get("soap_note", {})
+
+    st.subheader("SOAP Note")
+    st.caption("Edit any section below to add missing details. One finding per line.")
+
+    s = soap.get("subjective", {})
+    o = soap.get("objective", {})
+    a = soap.get("assessment", {})
+    p = soap.get("plan", {})
+
+    soap_subj = st.text_area(
+        "S: Subjective",
+        value=_bullets_to_text(s.get("findings", [])),
+        key="soap_subj",
+        height=200,
+    )
+
+    st.markdown("**O: Objective**")
+    soap_vitals = st.text_area(
+        "Vital signs",
+        value=_bullets_to_text(o.get("vital_signs", [])),
+        key="soap_vitals",
+        height=80,
+        placeholder="e.g. BP: 120/80, HR: 72",
+    )
+    soap_pe = st.text_area(
+        "Physical Examination",
+        value=_bullets_to_text(o.get("physical_exam", [])),
+        key="soap_pe",
+        height=120,
+    )
+    soap_mse = st.text_area(
+        "Mental state examination",
+        value=_bullets_to_text(o.get("mental_state_exam", [])),
+        key="soap_mse",
+        height=80,
+        placeholder="Optional — leave blank if not assessed",
+    )
+    soap_labs = st.text_area(
+        "Lab results",
+        value=_bullets_to_text(o.get("lab_results", [])),
+        key="soap_labs",
+        height=80,
+        placeholder="Optional — leave blank if none",
+    )
+
+    soap_assess = st.text_area(
+        "A: Assessment",
+        value=_bullets_to_text(a.get("findings", [])),
+        key="soap_assess",
+        height=100,
+    )
+
+    soap_plan = st.text_area(
+        "P: Plan",
+        value=_bullets_to_text(p.get("findings", [])),
+        key="soap_plan",
+        height=150,
+    )
+
+    soap_problems = st.text_area(
+        "Problem List",
+        value=_bullets_to_text(cn.get("problem_list", [])),
+        key="soap_problems",
+        height=80,
+    )
+
+    if cn.get("action_items"):
+        st.subheader("Action Items")
+        for item in cn["action_items"]:
+            priority_icon = _PRIORITY_ICON.get(item.get("priority", ""), "")
+            st.markdown(f"{priority_icon} {item['action']}")
+            if not item.get("verified", True):
+                st.caption("Warning: _Could not verify against transcript_")
+
+    if vid and st.button("Save SOAP Note", type="primary", key="save_soap"):
+        updated_note = {
+            "soap_note": {
+                "subjective": {
+                    "findings": _text_to_bullets(soap_subj),
+                    "evidence": s.get("evidence", []),
+                },
+                "objective": {
+                    "vital_signs": _text_to_bullets(soap_vitals),
+                    "physical_exam": _text_to_bullets(soap_pe),
+                    "mental_state_exam": _text_to_bullets(soap_mse),
+                    "lab_results": _text_to_bullets(soap_labs),
+                    "evidence": o.get("evidence", []),
+                },
+                "assessment": {
+                    "findings": _text_to_bullets(soap_assess),
+                    "evidence": a.get("evidence", []),
+                },
+                "plan": {
+                    "findings": _text_to_bullets(soap_plan),
+                    "evidence": p.get("evidence", []),
+                },
+            },
+            "problem_list": _text_to_bullets(soap_problems),
+            "action_items": cn.get("action_items", []),
+        }
+        result = api_put(
+            f"/api/visits/{vid}/clinician-note",
+            data=updated_note,
+        )
+        if result:
+            st.success("SOAP note saved successfully.")
+
+
+@st.fragment
+def _render_trials(analysis: dict):
+    """Trials & Literature tab, with per-paper relevance feedback."""
+    col_trials, col_papers = st.columns(2)
+
+    with col_trials:
+        st.subheader("Clinical Trials (Recruiting)")
+        trials = analysis.get("clinical_trials", [])
+        if trials:
+            for trial in trials:
+                st.markdown(f"**[{trial['title']}]({trial['url']})**")
+                st.caption(f"NCT: {trial['nct_id']} | Status: {trial['status']}")
+                st.caption(f"Conditions: {', '.join(trial.get('conditions', []))}")
+                st.caption(f"Why: {trial.get('match_explanation', '')}")
+                st.divider()
+        else:
+            st.info("No recruiting trials found.")
+
+    with col_papers:
+        st.subheader("Published Research")
+        papers = analysis.get("literature", [])
+        if papers:
+            for paper in papers:
+                st.markdown(f"**[{paper['title']}]({paper['url']})**")
+                authors = _format_authors(tuple(paper.get("authors", [])))
+                st.caption(f"{authors} ({paper.get('year', 'N/A')}) | Citations: {paper.get('citation_count', 0)}")
+                if paper.get("abstract_snippet"):
+                    st.caption(paper["abstract_snippet"])
+                st.caption(f"Relevance: {paper.get('relevance_explanation', '')}")
+
+                # Feedback buttons
+                fcol1, fcol2 = st.columns(2)
+                with fcol1:
+                    if st.button("Relevant", key=f"rel_{paper['paper_id']}"):
+                        _send_paper_feedback(analysis["visit_id"], paper, "relevant")
+                        st.success("Feedback sent!")
+                with fcol2:
+                    if st.button("Not relevant", key=f"nrel_{paper['paper_id']}"):
+                        _send_paper_feedback(analysis["visit_id"], paper, "not_relevant")
+                        st.success("Feedback sent!")
+                st.divider()
+        else:
+            st.info("No papers found.")
+
+
+@st.fragment
+def _render_review(analysis: dict):
+    """Review & Approve tab: doctor sign-off and approved-PDF export."""
+    st.subheader("Review & Approve for Patient")
+    st.caption(
+        "Review each extracted item below. Uncheck items that are "
+        "incorrect or should not appear in the patient's After Visit Summary. "
+        "Only approved items will be included in the PDF."
+    )
+
+    ps = analysis["patient_summary"]
+
+    # Visit summary letter (always included, editable)
+    st.caption(
+        "Edit the patient letter below. Replace [Patient's Name], "
+        "[Doctor's Name], and [Contact Information] with actual values."
+    )
+    with st.form("review_form", clear_on_submit=False):
+        reviewed_summary = st.text_area(
+            "Patient Letter",
+            value=ps.get("visit_summary", ""),
+            key="review_visit_summary",
+            height=300,
+        )
+
+        # Medications review
+        meds = ps.get("medications") or ()
+        approved_meds = []
+        if meds:
+            st.markdown("**Medications:**")
+            for i, med in enumerate(meds):
+                verified = med.get("verified", True)
+                label = f"{med['name']} {med.get('dose', '')} — {med.get('frequency', '')}"
+                if not verified:
+                    label += " (unverified)"
+                if st.checkbox(label, value=True, key=f"rev_med_{i}"):
+                    approved_meds.append(med)
+
+        # Tests review
+        tests = ps.get("tests_ordered") or ()
+        approved_tests = []
+        if tests:
+            st.markdown("**Tests Ordered:**")
+            for i, test in enumerate(tests):
+                verified = test.get("verified", True)
+                label = f"{test['test_name']} — {test.get('timeline', '')}"
+                if not verified:
+                    label += " (unverified)"
+                if st.checkbox(label, value=True, key=f"rev_test_{i}"):
+                    approved_tests.append(test)
+
+        # Follow-ups review
+        followups = ps.get("follow_up_plan") or ()
+        approved_followups = []
+        if followups:
+            st.markdown("**Follow-Up Plan:**")
+            for i, fu in enumerate(followups):
+                verified = fu.get("verified", True)
+                label = f"{fu['action']} — {fu.get('date_or_timeline', '')}"
+                if not verified:
+                    label += " (unverified)"
+                if st.checkbox(label, value=True, key=f"rev_fu_{i}"):
+                    approved_followups.append(fu)
+
+        # Lifestyle recommendations review
+        lifestyle = ps.get("lifestyle_recommendations") or ()
+        approved_lifestyle = []
+        if lifestyle:
+            st.markdown("**Lifestyle Recommendations:**")
+            for i, rec in enumerate(lifestyle):
+                verified = rec.get("verified", True)
+                label = rec["recommendation"]
+                if not verified:
+                    label += " (unverified)"
+                if st.checkbox(label, value=True, key=f"rev_life_{i}"):
+                    approved_lifestyle.append(rec)
+
+        # Red flags review
+        flags = ps.get("red_flags_for_patient") or ()
+        approved_flags = []
+        if flags:
+            st.markdown("**Red Flags / Urgent Care Warnings:**")
+            for i, rf in enumerate(flags):
+                verified = rf.get("verified", True)
+                label = rf["warning"]
+                if not verified:
+                    label += " (unverified)"
+                if st.checkbox(label, value=True, key=f"rev_rf_{i}"):
+                    approved_flags.append(rf)
+
+        # Q&A review
+        qas = ps.get("questions_and_answers") or ()
+        approved_qa = []
+        if qas:
+            st.markdown("**Questions & Answers:**")
+            for i, qa in enumerate(qas):
+                verified = qa.get("verified", True)
+                label = f"Q: {qa['question']}"
+                if not verified:
+                    label += " (unverified)"
+                if st.checkbox(label, value=True, key=f"rev_qa_{i}"):
+                    approved_qa.append(qa)
+
+        st.divider()
+
+        include_soap_in_pdf = st.checkbox(
+            "Include SOAP Note in PDF",
+            value=False,
+            key="review_include_soap",
+            help="Include the clinician SOAP note (with any edits) in the patient PDF.",
+        )
+
+        # Approve and generate
+        submitted = st.form_submit_button("Approve & Generate PDF", type="primary")
+    if submitted:
+        approved_summary = {
+            "visit_summary": reviewed_summary,
+            "medications": approved_meds,
+            "tests_ordered": approved_tests,
+            "follow_up_plan": approved_followups,
+            "lifestyle_recommendations": approved_lifestyle,
+            "red_flags_for_patient": approved_flags,
+            "questions_and_answers": approved_qa,
+        }
+        try:
+            pdf = fetch_reviewed_pdf(analysis["visit_id"], approved_summary, include_soap_in_pdf)
+            st.download_button(
+                "Download Approved After Visit Summary",
+                data=pdf,
+                file_name=f"MedSift_Visit_{analysis['visit_id']}_Approved.pdf",
+                mime="application/pdf",
+            )
+            st.success("PDF generated with doctor-approved items only.")
+        except Exception as e:
+            st.error(f"PDF generation failed: {e}")
+
+
 # --- Page Config ---
 st.set_page_config(
     page_title="MedSift AI",
@@ -124,11 +738,29 @@ if page == "Upload & Process":
         )
 
     if uploaded_file and st.button("Process Recording", type="primary"):
+        st.session_state.pop("pending_analysis", None)
+
+        # Catch doomed uploads before the transcribe round-trip; getbuffer() is a view, not a copy
+        audio = uploaded_file.getbuffer()
+        if not len(audio):
+            st.error("The uploaded file is empty.")
+            st.stop()
+        if not _looks_like_audio(bytes(audio[:12])):
+            st.warning("This file doesn't look like MP3, WAV, M4A or WebM audio. Sending it anyway.")
+        del audio  # release the buffer export before the file object is handed to requests
+
         # Step 1: Transcribe
         with st.spinner("Transcribing audio with Whisper..."):
+            # Hand requests the file object itself so the multipart body is
+            # read from it instead of from a getvalue() copy of the whole upload
+            uploaded_file.seek(0)
             result = api_post(
                 "/api/transcribe",
-                files={"file": (uploaded_file.name, uploaded_file.getvalue())},
+                files={"file": (
+                    uploaded_file.name,
+                    uploaded_file,
+                    uploaded_file.type or "application/octet-stream",
+                )},
             )
 
         if result:
@@ -156,382 +788,34 @@ if page == "Upload & Process":
                 st.success(f"Analysis complete! Visit ID: {analysis['visit_id']}")
                 st.session_state["last_visit_id"] = analysis["visit_id"]
 
-                # Store analysis for review
+                # Pin the analysis so later reruns render it again without re-posting
                 st.session_state["pending_analysis"] = analysis
 
-                # Display results in tabs
-                tab1, tab2, tab3, tab4 = st.tabs([
-                    "Care Plan", "SOAP Note", "Trials & Literature", "Review & Approve"
-                ])
-
-                with tab1:
-                    ps = analysis["patient_summary"]
-                    st.subheader("Patient Letter")
-                    st.markdown(ps.get("visit_summary", "").replace("\n", "  \n"))
-
-                    if ps.get("medications"):
-                        st.subheader("Medications")
-                        for med in ps["medications"]:
-                            verified = med.get("verified", True)
-                            badge = "Verified" if verified else "Unverified"
-                            st.markdown(f"**{med['name']}** {med['dose']} — {med['frequency']}")
-                            if med.get("instructions"):
-                                st.caption(f"Instructions: {med['instructions']}")
-                            if med.get("evidence"):
-                                st.caption(f"Evidence: _{med['evidence']}_")
-                            if not verified:
-                                st.caption("Warning: _Could not verify against transcript_")
-
-                    if ps.get("tests_ordered"):
-                        st.subheader("Tests Ordered")
-                        for test in ps["tests_ordered"]:
-                            st.markdown(f"**{test['test_name']}** — {test['timeline']}")
-                            if test.get("evidence"):
-                                st.caption(f"Evidence: _{test['evidence']}_")
-                            if not test.get("verified", True):
-                                st.caption("Warning: _Could not verify against transcript_")
-
-                    if ps.get("follow_up_plan"):
-                        st.subheader("Follow-Up Plan")
-                        for fu in ps["follow_up_plan"]:
-                            st.markdown(f"- [ ] **{fu['action']}** — {fu['date_or_timeline']}")
-                            if not fu.get("verified", True):
-                                st.caption("Warning: _Could not verify against transcript_")
-
-                    if ps.get("lifestyle_recommendations"):
-                        st.subheader("Lifestyle Recommendations")
-                        for rec in ps["lifestyle_recommendations"]:
-                            st.markdown(f"- **{rec['recommendation']}**: {rec.get('details', '')}")
-                            if not rec.get("verified", True):
-                                st.caption("Warning: _Could not verify against transcript_")
-
-                    if ps.get("red_flags_for_patient"):
-                        st.subheader("When to Seek Urgent Care")
-                        for rf in ps["red_flags_for_patient"]:
-                            st.warning(rf["warning"])
-                            if not rf.get("verified", True):
-                                st.caption("Warning: _Could not verify against transcript_")
-
-                    if ps.get("questions_and_answers"):
-                        st.subheader("Questions & Answers")
-                        for qa in ps["questions_and_answers"]:
-                            st.markdown(f"**Q:** {qa['question']}")
-                            st.markdown(f"**A:** {qa['answer']}")
-                            if not qa.get("verified", True):
-                                st.caption("Warning: _Could not verify against transcript_")
-                            st.divider()
+    analysis = st.session_state.get("pending_analysis")
+    if analysis:
+        # Display results in tabs
+        tab1, tab2, tab3, tab4 = st.tabs([
+            "Care Plan", "SOAP Note", "Trials & Literature", "Review & Approve"
+        ])
 
-                with tab2:
-                    cn = analysis["clinician_note"]
-                    soap = cn.get("soap_note", {})
-                    vid = analysis.get("visit_id")
-
-                    st.subheader("SOAP Note")
-                    st.caption("Edit any section below to add missing details. One finding per line.")
-
-                    s = soap.get("subjective", {})
-                    o = soap.get("objective", {})
-                    a = soap.get("assessment", {})
-                    p = soap.get("plan", {})
-
-                    soap_subj = st.text_area(
-                        "S: Subjective",
-                        value=_bullets_to_text(s.get("findings", [])),
-                        key="soap_subj",
-                        height=200,
-                    )
-
-                    st.markdown("**O: Objective**")
-                    soap_vitals = st.text_area(
-                        "Vital signs",
-                        value=_bullets_to_text(o.get("vital_signs", [])),
-                        key="soap_vitals",
-                        height=80,
-                        placeholder="e.g. BP: 120/80, HR: 72",
-                    )
-                    soap_pe = st.text_area(
-                        "Physical Examination",
-                        value=_bullets_to_text(o.get("physical_exam", [])),
-                        key="soap_pe",
-                        height=120,
-                    )
-                    soap_mse = st.text_area(
-                        "Mental state examination",
-                        value=_bullets_to_text(o.get("mental_state_exam", [])),
-                        key="soap_mse",
-                        height=80,
-                        placeholder="Optional — leave blank if not assessed",
-                    )
-                    soap_labs = st.text_area(
-                        "Lab results",
-                        value=_bullets_to_text(o.get("lab_results", [])),
-                        key="soap_labs",
-                        height=80,
-                        placeholder="Optional — leave blank if none",
-                    )
-
-                    soap_assess = st.text_area(
-                        "A: Assessment",
-                        value=_bullets_to_text(a.get("findings", [])),
-                        key="soap_assess",
-                        height=100,
-                    )
-
-                    soap_plan = st.text_area(
-                        "P: Plan",
-                        value=_bullets_to_text(p.get("findings", [])),
-                        key="soap_plan",
-                        height=150,
-                    )
-
-                    soap_problems = st.text_area(
-                        "Problem List",
-                        value=_bullets_to_text(cn.get("problem_list", [])),
-                        key="soap_problems",
-                        height=80,
-                    )
-
-                    if cn.get("action_items"):
-                        st.subheader("Action Items")
-                        for item in cn["action_items"]:
-                            priority_icon = {"high": "[HIGH]", "medium": "[MED]", "low": "[LOW]"}.get(item.get("priority", ""), "")
-                            st.markdown(f"{priority_icon} {item['action']}")
-                            if not item.get("verified", True):
-                                st.caption("Warning: _Could not verify against transcript_")
-
-                    if vid and st.button("Save SOAP Note", type="primary", key="save_soap"):
-                        updated_note = {
-                            "soap_note": {
-                                "subjective": {
-                                    "findings": _text_to_bullets(soap_subj),
-                                    "evidence": s.get("evidence", []),
-                                },
-                                "objective": {
-                                    "vital_signs": _text_to_bullets(soap_vitals),
-                                    "physical_exam": _text_to_bullets(soap_pe),
-                                    "mental_state_exam": _text_to_bullets(soap_mse),
-                                    "lab_results": _text_to_bullets(soap_labs),
-                                    "evidence": o.get("evidence", []),
-                                },
-                                "assessment": {
-                                    "findings": _text_to_bullets(soap_assess),
-                                    "evidence": a.get("evidence", []),
-                                },
-                                "plan": {
-                                    "findings": _text_to_bullets(soap_plan),
-                                    "evidence": p.get("evidence", []),
-                                },
-                            },
-                            "problem_list": _text_to_bullets(soap_problems),
-                            "action_items": cn.get("action_items", []),
-                        }
-                        result = api_put(
-                            f"/api/visits/{vid}/clinician-note",
-                            data=updated_note,
-                        )
-                        if result:
-                            st.success("SOAP note saved successfully.")
-
-                with tab3:
-                    col_trials, col_papers = st.columns(2)
-
-                    with col_trials:
-                        st.subheader("Clinical Trials (Recruiting)")
-                        trials = analysis.get("clinical_trials", [])
-                        if trials:
-                            for trial in trials:
-                                st.markdown(f"**[{trial['title']}]({trial['url']})**")
-                                st.caption(f"NCT: {trial['nct_id']} | Status: {trial['status']}")
-                                st.caption(f"Conditions: {', '.join(trial.get('conditions', []))}")
-                                st.caption(f"Why: {trial.get('match_explanation', '')}")
-                                st.divider()
-                        else:
-                            st.info("No recruiting trials found.")
-
-                    with col_papers:
-                        st.subheader("Published Research")
-                        papers = analysis.get("literature", [])
-                        if papers:
-                            for paper in papers:
-                                st.markdown(f"**[{paper['title']}]({paper['url']})**")
-                                authors = ", ".join(paper.get("authors", [])[:3])
-                                if len(paper.get("authors", [])) > 3:
-                                    authors += " et al."
-                                st.caption(f"{authors} ({paper.get('year', 'N/A')}) | Citations: {paper.get('citation_count', 0)}")
-                                if paper.get("abstract_snippet"):
-                                    st.caption(paper["abstract_snippet"])
-                                st.caption(f"Relevance: {paper.get('relevance_explanation', '')}")
-
-                                # Feedback buttons
-                                fcol1, fcol2 = st.columns(2)
-                                with fcol1:
-                                    if st.button("Relevant", key=f"rel_{paper['paper_id']}"):
-                                        api_post("/api/feedback", data={
-                                            "visit_id": analysis["visit_id"],
-                                            "feedback_type": "literature_relevance",
-                                            "item_type": "paper",
-                                            "item_value": paper["title"],
-                                            "rating": "relevant",
-                                            "paper_url": paper.get("url", ""),
-                                        })
-                                        st.success("Feedback recorded!")
-                                with fcol2:
-                                    if st.button("Not relevant", key=f"nrel_{paper['paper_id']}"):
-                                        api_post("/api/feedback", data={
-                                            "visit_id": analysis["visit_id"],
-                                            "feedback_type": "literature_relevance",
-                                            "item_type": "paper",
-                                            "item_value": paper["title"],
-                                            "rating": "not_relevant",
-                                            "paper_url": paper.get("url", ""),
-                                        })
-                                        st.success("Feedback recorded!")
-                                st.divider()
-                        else:
-                            st.info("No papers found.")
-
-                with tab4:
-                    st.subheader("Review & Approve for Patient")
-                    st.caption(
-                        "Review each extracted item below. Uncheck items that are "
-                        "incorrect or should not appear in the patient's After Visit Summary. "
-                        "Only approved items will be included in the PDF."
-                    )
-
-                    ps = analysis["patient_summary"]
-
-                    # Visit summary letter (always included, editable)
-                    st.caption(
-                        "Edit the patient letter below. Replace [Patient's Name], "
-                        "[Doctor's Name], and [Contact Information] with actual values."
-                    )
-                    reviewed_summary = st.text_area(
-                        "Patient Letter",
-                        value=ps.get("visit_summary", ""),
-                        key="review_visit_summary",
-                        height=300,
-                    )
-
-                    # Medications review
-                    approved_meds = []
-                    if ps.get("medications"):
-                        st.markdown("**Medications:**")
-                        for i, med in enumerate(ps["medications"]):
-                            verified = med.get("verified", True)
-                            label = f"{med['name']} {med.get('dose', '')} — {med.get('frequency', '')}"
-                            if not verified:
-                                label += " (unverified)"
-                            if st.checkbox(label, value=True, key=f"rev_med_{i}"):
-                                approved_meds.append(med)
-
-                    # Tests review
-                    approved_tests = []
-                    if ps.get("tests_ordered"):
-                        st.markdown("**Tests Ordered:**")
-                        for i, test in enumerate(ps["tests_ordered"]):
-                            verified = test.get("verified", True)
-                            label = f"{test['test_name']} — {test.get('timeline', '')}"
-                            if not verified:
-                                label += " (unverified)"
-                            if st.checkbox(label, value=True, key=f"rev_test_{i}"):
-                                approved_tests.append(test)
-
-                    # Follow-ups review
-                    approved_followups = []
-                    if ps.get("follow_up_plan"):
-                        st.markdown("**Follow-Up Plan:**")
-                        for i, fu in enumerate(ps["follow_up_plan"]):
-                            verified = fu.get("verified", True)
-                            label = f"{fu['action']} — {fu.get('date_or_timeline', '')}"
-                            if not verified:
-                                label += " (unverified)"
-                            if st.checkbox(label, value=True, key=f"rev_fu_{i}"):
-                                approved_followups.append(fu)
-
-                    # Lifestyle recommendations review
-                    approved_lifestyle = []
-                    if ps.get("lifestyle_recommendations"):
-                        st.markdown("**Lifestyle Recommendations:**")
-                        for i, rec in enumerate(ps["lifestyle_recommendations"]):
-                            verified = rec.get("verified", True)
-                            label = rec["recommendation"]
-                            if not verified:
-                                label += " (unverified)"
-                            if st.checkbox(label, value=True, key=f"rev_life_{i}"):
-                                approved_lifestyle.append(rec)
-
-                    # Red flags review
-                    approved_flags = []
-                    if ps.get("red_flags_for_patient"):
-                        st.markdown("**Red Flags / Urgent Care Warnings:**")
-                        for i, rf in enumerate(ps["red_flags_for_patient"]):
-                            verified = rf.get("verified", True)
-                            label = rf["warning"]
-                            if not verified:
-                                label += " (unverified)"
-                            if st.checkbox(label, value=True, key=f"rev_rf_{i}"):
-                                approved_flags.append(rf)
-
-                    # Q&A review
-                    approved_qa = []
-                    if ps.get("questions_and_answers"):
-                        st.markdown("**Questions & Answers:**")
-                        for i, qa in enumerate(ps["questions_and_answers"]):
-                            verified = qa.get("verified", True)
-                            label = f"Q: {qa['question']}"
-                            if not verified:
-                                label += " (unverified)"
-                            if st.checkbox(label, value=True, key=f"rev_qa_{i}"):
-                                approved_qa.append(qa)
-
-                    st.divider()
-
-                    include_soap_in_pdf = st.checkbox(
-                        "Include SOAP Note in PDF",
-                        value=False,
-                        key="review_include_soap",
-                        help="Include the clinician SOAP note (with any edits) in the patient PDF.",
-                    )
-
-                    # Approve and generate
-                    if st.button("Approve & Generate PDF", type="primary"):
-                        approved_summary = {
-                            "visit_summary": reviewed_summary,
-                            "medications": approved_meds,
-                            "tests_ordered": approved_tests,
-                            "follow_up_plan": approved_followups,
-                            "lifestyle_recommendations": approved_lifestyle,
-                            "red_flags_for_patient": approved_flags,
-                            "questions_and_answers": approved_qa,
-                        }
-                        try:
-                            r = requests.post(
-                                f"{API_BASE}/api/export/reviewed/pdf",
-                                json={
-                                    "visit_id": analysis["visit_id"],
-                                    "approved_summary": approved_summary,
-                                    "include_soap": include_soap_in_pdf,
-                                },
-                                timeout=30,
-                            )
-                            r.raise_for_status()
-                            st.download_button(
-                                "Download Approved After Visit Summary",
-                                data=r.content,
-                                file_name=f"MedSift_Visit_{analysis['visit_id']}_Approved.pdf",
-                                mime="application/pdf",
-                            )
-                            st.success("PDF generated with doctor-approved items only.")
-                        except Exception as e:
-                            st.error(f"PDF generation failed: {e}")
+        with tab1:
+            _render_care_plan(analysis["patient_summary"])
+
+        with tab2:
+            _render_soap(analysis["clinician_note"], analysis.get("visit_id"))
+
+        with tab3:
+            _render_trials(analysis)
+
+        with tab4:
+            _render_review(analysis)
 
 
 # ========================================
 # PAGE: Live Transcription
 # ========================================
 elif page == "Live Transcription":
-    from live_transcribe_component import render_live_transcription_tab
-    render_live_transcription_tab()
+    _live_tab()()
 
 
 # ========================================
@@ -541,7 +825,10 @@ elif page == "Visit History":
     st.header("Visit History")
 
     search = st.text_input("Search visits", placeholder="Search transcripts...")
-    data = api_get("/api/visits", params={"search": search} if search else None)
+    params = {"light": "true"}
+    if search:
+        params["search"] = search
+    data = api_get("/api/visits", params=params)
 
     if data and data.get("visits"):
         for visit in data["visits"]:
@@ -561,33 +848,34 @@ elif page == "Visit History":
                     else:
                         st.markdown(f"**Summary:** {summary_preview}")
 
-                    if ps.get("medications"):
+                    meds = ps.get("medications") or ()
+                    if meds:
                         st.markdown("**Medications:**")
-                        for med in ps["medications"]:
+                        for med in meds:
                             st.markdown(f"- {med['name']} {med.get('dose', '')}")
 
                             # Feedback buttons for extraction accuracy
                             fcol1, fcol2, fcol3 = st.columns(3)
                             with fcol1:
                                 if st.button("Correct", key=f"c_{visit['id']}_{med['name']}"):
-                                    api_post("/api/feedback", data={
+                                    send_feedback_async({
                                         "visit_id": visit["id"],
                                         "feedback_type": "extraction_accuracy",
                                         "item_type": "medication",
                                         "item_value": f"{med['name']} {med.get('dose', '')}",
                                         "rating": "correct",
                                     })
-                                    st.success("Feedback recorded!")
+                                    st.success("Feedback sent!")
                             with fcol2:
                                 if st.button("Incorrect", key=f"i_{visit['id']}_{med['name']}"):
-                                    api_post("/api/feedback", data={
+                                    send_feedback_async({
                                         "visit_id": visit["id"],
                                         "feedback_type": "extraction_accuracy",
                                         "item_type": "medication",
                                         "item_value": f"{med['name']} {med.get('dose', '')}",
                                         "rating": "incorrect",
                                     })
-                                    st.success("Feedback recorded!")
+                                    st.success("Feedback sent!")
 
                 # Editable SOAP Note
                 if visit.get("clinician_note"):
@@ -715,87 +1003,95 @@ elif page == "Visit History":
                             "Edit the patient letter below. Replace [Patient's Name], "
                             "[Doctor's Name], and [Contact Information] with actual values."
                         )
-                        reviewed_summary = st.text_area(
-                            "Patient Letter",
-                            value=ps.get("visit_summary", ""),
-                            key=f"hist_summary_{vid}",
-                            height=300,
-                        )
+                        with st.form(f"hist_review_form_{vid}", clear_on_submit=False):
+                            reviewed_summary = st.text_area(
+                                "Patient Letter",
+                                value=ps.get("visit_summary", ""),
+                                key=f"hist_summary_{vid}",
+                                height=300,
+                            )
 
-                        approved_meds = []
-                        if ps.get("medications"):
-                            st.markdown("**Medications:**")
-                            for i, med in enumerate(ps["medications"]):
-                                verified = med.get("verified", True)
-                                label = f"{med['name']} {med.get('dose', '')} — {med.get('frequency', '')}"
-                                if not verified:
-                                    label += " (unverified)"
-                                if st.checkbox(label, value=True, key=f"hist_med_{vid}_{i}"):
-                                    approved_meds.append(med)
-
-                        approved_tests = []
-                        if ps.get("tests_ordered"):
-                            st.markdown("**Tests Ordered:**")
-                            for i, test in enumerate(ps["tests_ordered"]):
-                                verified = test.get("verified", True)
-                                label = f"{test['test_name']} — {test.get('timeline', '')}"
-                                if not verified:
-                                    label += " (unverified)"
-                                if st.checkbox(label, value=True, key=f"hist_test_{vid}_{i}"):
-                                    approved_tests.append(test)
-
-                        approved_followups = []
-                        if ps.get("follow_up_plan"):
-                            st.markdown("**Follow-Up Plan:**")
-                            for i, fu in enumerate(ps["follow_up_plan"]):
-                                verified = fu.get("verified", True)
-                                label = f"{fu['action']} — {fu.get('date_or_timeline', '')}"
-                                if not verified:
-                                    label += " (unverified)"
-                                if st.checkbox(label, value=True, key=f"hist_fu_{vid}_{i}"):
-                                    approved_followups.append(fu)
-
-                        approved_lifestyle = []
-                        if ps.get("lifestyle_recommendations"):
-                            st.markdown("**Lifestyle Recommendations:**")
-                            for i, rec in enumerate(ps["lifestyle_recommendations"]):
-                                verified = rec.get("verified", True)
-                                label = rec["recommendation"]
-                                if not verified:
-                                    label += " (unverified)"
-                                if st.checkbox(label, value=True, key=f"hist_life_{vid}_{i}"):
-                                    approved_lifestyle.append(rec)
-
-                        approved_flags = []
-                        if ps.get("red_flags_for_patient"):
-                            st.markdown("**Red Flags / Urgent Care Warnings:**")
-                            for i, rf in enumerate(ps["red_flags_for_patient"]):
-                                verified = rf.get("verified", True)
-                                label = rf["warning"]
-                                if not verified:
-                                    label += " (unverified)"
-                                if st.checkbox(label, value=True, key=f"hist_rf_{vid}_{i}"):
-                                    approved_flags.append(rf)
-
-                        approved_qa = []
-                        if ps.get("questions_and_answers"):
-                            st.markdown("**Questions & Answers:**")
-                            for i, qa in enumerate(ps["questions_and_answers"]):
-                                verified = qa.get("verified", True)
-                                label = f"Q: {qa['question']}"
-                                if not verified:
-                                    label += " (unverified)"
-                                if st.checkbox(label, value=True, key=f"hist_qa_{vid}_{i}"):
-                                    approved_qa.append(qa)
-
-                        st.divider()
-                        hist_include_soap = st.checkbox(
-                            "Include SOAP Note in PDF",
-                            value=False,
-                            key=f"hist_include_soap_{vid}",
-                            help="Include the clinician SOAP note (with any edits) in the patient PDF.",
-                        )
-                        if st.button("Approve & Generate PDF", type="primary", key=f"hist_approve_{vid}"):
+                            meds = ps.get("medications") or ()
+                            approved_meds = []
+                            if meds:
+                                st.markdown("**Medications:**")
+                                for i, med in enumerate(meds):
+                                    verified = med.get("verified", True)
+                                    label = f"{med['name']} {med.get('dose', '')} — {med.get('frequency', '')}"
+                                    if not verified:
+                                        label += " (unverified)"
+                                    if st.checkbox(label, value=True, key=f"hist_med_{vid}_{i}"):
+                                        approved_meds.append(med)
+
+                            tests = ps.get("tests_ordered") or ()
+                            approved_tests = []
+                            if tests:
+                                st.markdown("**Tests Ordered:**")
+                                for i, test in enumerate(tests):
+                                    verified = test.get("verified", True)
+                                    label = f"{test['test_name']} — {test.get('timeline', '')}"
+                                    if not verified:
+                                        label += " (unverified)"
+                                    if st.checkbox(label, value=True, key=f"hist_test_{vid}_{i}"):
+                                        approved_tests.append(test)
+
+                            followups = ps.get("follow_up_plan") or ()
+                            approved_followups = []
+                            if followups:
+                                st.markdown("**Follow-Up Plan:**")
+                                for i, fu in enumerate(followups):
+                                    verified = fu.get("verified", True)
+                                    label = f"{fu['action']} — {fu.get('date_or_timeline', '')}"
+                                    if not verified:
+                                        label += " (unverified)"
+                                    if st.checkbox(label, value=True, key=f"hist_fu_{vid}_{i}"):
+                                        approved_followups.append(fu)
+
+                            lifestyle = ps.get("lifestyle_recommendations") or ()
+                            approved_lifestyle = []
+                            if lifestyle:
+                                st.markdown("**Lifestyle Recommendations:**")
+                                for i, rec in enumerate(lifestyle):
+                                    verified = rec.get("verified", True)
+                                    label = rec["recommendation"]
+                                    if not verified:
+                                        label += " (unverified)"
+                                    if st.checkbox(label, value=True, key=f"hist_life_{vid}_{i}"):
+                                        approved_lifestyle.append(rec)
+
+                            flags = ps.get("red_flags_for_patient") or ()
+                            approved_flags = []
+                            if flags:
+                                st.markdown("**Red Flags / Urgent Care Warnings:**")
+                                for i, rf in enumerate(flags):
+                                    verified = rf.get("verified", True)
+                                    label = rf["warning"]
+                                    if not verified:
+                                        label += " (unverified)"
+                                    if st.checkbox(label, value=True, key=f"hist_rf_{vid}_{i}"):
+                                        approved_flags.append(rf)
+
+                            qas = ps.get("questions_and_answers") or ()
+                            approved_qa = []
+                            if qas:
+                                st.markdown("**Questions & Answers:**")
+                                for i, qa in enumerate(qas):
+                                    verified = qa.get("verified", True)
+                                    label = f"Q: {qa['question']}"
+                                    if not verified:
+                                        label += " (unverified)"
+                                    if st.checkbox(label, value=True, key=f"hist_qa_{vid}_{i}"):
+                                        approved_qa.append(qa)
+
+                            st.divider()
+                            hist_include_soap = st.checkbox(
+                                "Include SOAP Note in PDF",
+                                value=False,
+                                key=f"hist_include_soap_{vid}",
+                                help="Include the clinician SOAP note (with any edits) in the patient PDF.",
+                            )
+                            submitted = st.form_submit_button("Approve & Generate PDF", type="primary")
+                        if submitted:
                             approved_summary = {
                                 "visit_summary": reviewed_summary,
                                 "medications": approved_meds,
@@ -806,19 +1102,10 @@ elif page == "Visit History":
                                 "questions_and_answers": approved_qa,
                             }
                             try:
-                                r = requests.post(
-                                    f"{API_BASE}/api/export/reviewed/pdf",
-                                    json={
-                                        "visit_id": vid,
-                                        "approved_summary": approved_summary,
-                                        "include_soap": hist_include_soap,
-                                    },
-                                    timeout=30,
-                                )
-                                r.raise_for_status()
+                                pdf = fetch_reviewed_pdf(vid, approved_summary, hist_include_soap)
                                 st.download_button(
                                     "Download Approved After Visit Summary",
-                                    data=r.content,
+                                    data=pdf,
                                     file_name=f"MedSift_Visit_{vid}_Approved.pdf",
                                     mime="application/pdf",
                                     key=f"hist_dl_{vid}",
@@ -836,8 +1123,7 @@ elif page == "Visit History":
 elif page == "Analytics Dashboard":
     st.header("Analytics Dashboard")
 
-    analytics = api_get("/api/analytics")
-    fb_analytics = api_get("/api/feedback/analytics")
+    analytics, fb_analytics = api_get_parallel("/api/analytics", "/api/feedback/analytics")
 
     if analytics:
         # Key metrics
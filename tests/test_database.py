@@ -0,0 +1,378 @@
+"""Tests for the SQLite persistence layer.
+
+Each test runs against a fresh database file in a temp directory.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import models.database as db
+from models.schemas import (
+    VisitRecord, VisitSummary, PatientSummary, ClinicianNote, SOAPNote, Assessment, Plan,
+    Medication, LiteratureResult, FeedbackItem, TranscriptSegment,
+)
+
+
+@contextmanager
+def _use_db(path):
+    """Point the database module at `path`; the pool is rebuilt on both sides."""
+    db.close_pool()
+    with patch.object(db, "DATABASE_PATH", path):
+        try:
+            yield
+        finally:
+            db.close_pool()
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Point the database module at a throwaway file and initialize it."""
+    with _use_db(str(tmp_path / "test.db")):
+        db.init_db()
+        yield
+
+
+def _visit(transcript="Patient reports chest pain.", tags=None, findings=None):
+    return VisitRecord(
+        visit_type="follow-up",
+        tags=tags or [],
+        raw_transcript=transcript,
+        patient_summary=PatientSummary(medications=[Medication(name="Metformin", dose="500mg")]),
+        clinician_note=ClinicianNote(soap_note=SOAPNote(
+            assessment=Assessment(findings=findings or []),
+        )),
+    )
+
+
+def test_save_and_get_visit_roundtrip(temp_db):
+    """A saved visit reads back with its nested models intact."""
+    visit_id = db.save_visit(_visit(tags=["cardio"]))
+
+    visit = db.get_visit(visit_id)
+
+    assert visit.id == visit_id
+    assert visit.tags == ["cardio"]
+    assert visit.raw_transcript == "Patient reports chest pain."
+    assert visit.patient_summary.medications[0].name == "Metformin"
+    assert db.get_visit(visit_id + 1) is None
+
+
+def test_row_to_visit_rebuilds_nested_models(temp_db):
+    """Stored JSON comes back as real nested model instances, not dicts."""
+    visit_id = db.save_visit(_visit(findings=["Hypertension"]))
+
+    visit = db.get_visit(visit_id)
+
+    assert isinstance(visit.patient_summary.medications[0], Medication)
+    assert isinstance(visit.clinician_note.soap_note.assessment, Assessment)
+    assert visit.clinician_note.soap_note.assessment.findings == ["Hypertension"]
+    assert visit.clinician_note.action_items == []
+    assert visit.model_dump()["patient_summary"]["medications"][0]["dose"] == "500mg"
+
+
+def test_save_visits_bulk(temp_db):
+    """Bulk saves return IDs in input order and keep FTS, tags, and conditions in sync."""
+    ids = db.save_visits_bulk([
+        _visit(transcript="Asthma follow-up.", tags=["pulm"], findings=["Asthma"]),
+        _visit(transcript="Knee pain.", tags=["ortho"]),
+    ])
+
+    assert ids == sorted(ids) and len(ids) == 2
+    assert [v.id for v in db.get_all_visits(search="asthma")] == [ids[0]]
+    assert [v.id for v in db.get_all_visits(tag="ortho")] == [ids[1]]
+    assert db.get_analytics().top_conditions == [{"condition": "asthma", "count": 1}]
+    assert db.save_visits_bulk([]) == []
+
+
+def test_bulk_load_visits_rebuilds_fts(temp_db):
+    """Bulk loads are searchable after the rebuild and the insert trigger comes back."""
+    existing = db.save_visit(_visit(transcript="Asthma review."))
+    ids = db.bulk_load_visits([
+        _visit(transcript="Asthma flare overnight.", tags=["pulm"]),
+        _visit(transcript="Migraine with aura."),
+    ])
+    later = db.save_visit(_visit(transcript="Asthma inhaler refill."))
+
+    assert {v.id for v in db.get_all_visits(search="asthma")} == {existing, ids[0], later}
+    assert [v.id for v in db.get_all_visits(tag="pulm")] == [ids[0]]
+
+
+def test_bulk_load_visits_rolls_back_on_error(temp_db):
+    """A failing bulk load leaves no rows behind and keeps the FTS trigger."""
+    with patch.object(db, "_store_conditions", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError):
+            db.bulk_load_visits([_visit(transcript="Asthma flare.")])
+
+    assert db.get_all_visits() == []
+    visit_id = db.save_visit(_visit(transcript="Asthma flare."))
+    assert [v.id for v in db.get_all_visits(search="asthma")] == [visit_id]
+
+
+def test_pool_reuses_connections(temp_db):
+    """Sequential calls borrow the same pooled connection instead of reopening."""
+    with db._reader() as first:
+        pass
+    with db._reader() as second:
+        pass
+    assert first is second
+    with db._writer() as first:
+        pass
+    with db._writer() as second:
+        pass
+    assert first is second
+
+
+def test_pool_connection_pragmas(temp_db):
+    """The writer runs in WAL mode with NORMAL sync; readers can't write."""
+    with db._writer() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    with db._reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO visits (raw_transcript) VALUES ('x')")
+
+
+def test_pool_concurrent_borrowers_get_distinct_connections(temp_db):
+    """Nested/concurrent readers never share a connection, and reads don't wait on the writer."""
+    with db._reader() as outer:
+        with db._reader() as inner:
+            assert outer is not inner
+        with db._writer() as writer:
+            writer.execute("INSERT INTO visits (raw_transcript) VALUES ('pending')")
+            # Uncommitted writes are invisible to readers, who aren't blocked
+            assert db.get_all_visits() == []
+            writer.commit()
+    assert len(db.get_all_visits()) == 1
+
+
+def test_pool_rolls_back_abandoned_transaction(temp_db):
+    """An exception mid-transaction doesn't leak uncommitted writes to the next borrower."""
+    with pytest.raises(RuntimeError):
+        with db._writer() as conn:
+            conn.execute("INSERT INTO visits (raw_transcript) VALUES ('partial')")
+            raise RuntimeError("boom")
+
+    assert db.get_all_visits() == []
+
+
+def test_pool_thread_safety(temp_db):
+    """Concurrent writers from several threads all land."""
+    def worker():
+        for _ in range(5):
+            db.save_visit(_visit())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(db.get_all_visits(limit=100)) == 20
+
+
+def test_search_and_tag_filter(temp_db):
+    """FTS search and tag filtering return the matching visits."""
+    a = db.save_visit(_visit(transcript="Discussed asthma inhaler use.", tags=["pulm"]))
+    b = db.save_visit(_visit(transcript="Knee pain after running.", tags=["ortho"]))
+
+    assert [v.id for v in db.get_all_visits(search="asthma")] == [a]
+    assert [v.id for v in db.get_all_visits(tag="ortho")] == [b]
+
+
+def test_tag_index_tracks_visit_changes(temp_db):
+    """visit_tags follows inserts, tag edits, and deletes; lookups ignore case."""
+    visit_id = db.save_visit(_visit(tags=["Cardio", "cardio", "renal"]))
+    assert [v.id for v in db.get_all_visits(tag="CARDIO")] == [visit_id]
+
+    with db._writer() as conn:
+        conn.execute("UPDATE visits SET tags = ? WHERE id = ?", ('["renal"]', visit_id))
+        conn.commit()
+    assert db.get_all_visits(tag="cardio") == []
+    assert [v.id for v in db.get_all_visits(tag="renal")] == [visit_id]
+
+    db.delete_visit(visit_id)
+    with db._reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM visit_tags").fetchone()[0] == 0
+
+
+def test_light_listing_skips_heavy_columns(temp_db):
+    """light=True returns VisitSummary entries without trials, literature, or segments."""
+    visit_id = db.save_visit(_visit(tags=["cardio"]))
+    db.update_literature_results(visit_id, [LiteratureResult(paper_id="p1", title="T")])
+
+    for kwargs in ({}, {"search": "chest"}, {"tag": "cardio"}):
+        [summary] = db.get_all_visits(light=True, **kwargs)
+        assert type(summary) is VisitSummary
+        assert "literature_results" not in summary.model_dump()
+        assert summary.patient_summary.medications[0].name == "Metformin"
+
+    [full] = db.get_all_visits()
+    assert full.literature_results[0].paper_id == "p1"
+
+
+def test_large_list_columns_are_compressed(temp_db):
+    """Big list payloads are stored as compressed BLOBs and still read back intact."""
+    visit = _visit()
+    visit.transcript_segments = [
+        TranscriptSegment(start_time=i, end_time=i + 1, text=f"segment {i} of the visit")
+        for i in range(200)
+    ]
+    visit_id = db.save_visit(visit)
+
+    with db._reader() as conn:
+        kinds = conn.execute(
+            "SELECT typeof(transcript_segments_json), typeof(clinical_trials_json) FROM visits WHERE id = ?",
+            (visit_id,),
+        ).fetchone()
+    assert tuple(kinds) == ("blob", "text")
+    segments = db.get_visit(visit_id).transcript_segments
+    assert len(segments) == 200
+    assert segments[-1].text == "segment 199 of the visit"
+
+
+def test_update_literature_results(temp_db):
+    """Cached literature results are replaced in place."""
+    visit_id = db.save_visit(_visit())
+    papers = [LiteratureResult(paper_id="p1", title="Metformin outcomes")]
+
+    assert db.update_literature_results(visit_id, papers) is True
+    assert db.get_visit(visit_id).literature_results[0].title == "Metformin outcomes"
+
+
+def test_feedback_and_keyword_boost(temp_db):
+    """Feedback is stored and keyword boosts accumulate across votes."""
+    visit_id = db.save_visit(_visit())
+    db.save_feedback(FeedbackItem(
+        visit_id=visit_id, feedback_type="extraction_accuracy",
+        item_type="medication", item_value="Metformin", rating="correct",
+    ))
+    db.update_keyword_boost(["Diabetes", "ab"], positive=True)
+    db.update_keyword_boost(["diabetes", "insulin "], positive=False)
+    db.update_keyword_boost([], positive=True)
+
+    assert len(db.get_feedback(visit_id)) == 1
+    boosted = {kw.keyword: kw for kw in db.get_boosted_keywords()}
+    assert set(boosted) == {"diabetes", "insulin"}
+    assert boosted["insulin"].boost_score == 0.0
+    assert boosted["diabetes"].positive_count == 1
+    assert boosted["diabetes"].negative_count == 1
+    assert boosted["diabetes"].boost_score == pytest.approx(0.5)
+
+
+def test_feedback_and_visit_analytics(temp_db):
+    """Analytics aggregate feedback rates and cleaned assessment conditions."""
+    visit_id = db.save_visit(_visit(findings=["Type 2 diabetes; hypertension"]))
+    db.save_visit(_visit(findings=["Possible hypertension"]))
+    for item_type, rating in [("medication", "correct"), ("medication", "incorrect"), ("test", "correct")]:
+        db.save_feedback(FeedbackItem(
+            visit_id=visit_id, feedback_type="extraction_accuracy",
+            item_type=item_type, item_value="x", rating=rating,
+        ))
+
+    db.save_feedback(FeedbackItem(
+        visit_id=visit_id, feedback_type="literature_relevance",
+        item_type="paper", item_value="Metformin outcomes", rating="relevant",
+    ))
+
+    fb = db.get_feedback_analytics()
+    assert fb.total_feedback_count == 4
+    assert fb.extraction_accuracy_rate == pytest.approx(0.667)
+    assert fb.accuracy_by_item_type == {"medication": 0.5, "test": 1.0}
+    assert fb.literature_relevance_rate == 1.0
+    assert fb.most_relevant_papers[0]["title"] == "Metformin outcomes"
+
+    summary = db.get_analytics()
+    assert summary.total_visits == 2
+    assert summary.top_conditions[0] == {"condition": "hypertension", "count": 2}
+
+
+def test_analytics_follow_clinician_note_updates(temp_db):
+    """Editing or deleting a note updates the condition and plan counts."""
+    visit_id = db.save_visit(_visit(findings=["Asthma"]))
+    note = ClinicianNote(soap_note=SOAPNote(
+        assessment=Assessment(findings=["Migraine, asthma"]),
+        plan=Plan(findings=["Start sumatriptan"]),
+    ))
+
+    assert db.update_clinician_note(visit_id, note) is True
+    assert db.update_clinician_note(visit_id + 1, note) is False
+    summary = db.get_analytics()
+    assert summary.top_conditions == [
+        {"condition": "asthma", "count": 1}, {"condition": "migraine", "count": 1},
+    ]
+    assert summary.top_medications == [{"medication": "Start sumatriptan", "count": 1}]
+
+    db.delete_visit(visit_id)
+    summary = db.get_analytics()
+    assert summary.top_conditions == []
+    assert summary.top_medications == []
+
+
+def test_analytics_cached_until_next_write(temp_db):
+    """Analytics are served from cache until a write goes through the module."""
+    db.save_visit(_visit())
+    assert db.get_analytics().total_visits == 1
+
+    # A write that bypasses the module isn't seen until the TTL or the next write
+    with db._writer() as conn:
+        conn.execute("INSERT INTO visits (raw_transcript) VALUES ('direct')")
+        conn.commit()
+    assert db.get_analytics().total_visits == 1
+
+    db.save_feedback(FeedbackItem(
+        visit_id=1, feedback_type="extraction_accuracy",
+        item_type="test", item_value="x", rating="correct",
+    ))
+    assert db.get_analytics().total_visits == 2
+    assert db.get_feedback_analytics().total_feedback_count == 1
+
+
+def test_keyword_boost_migrates_to_generated_score(tmp_path):
+    """An old keyword_boost table with a plain boost_score column is rebuilt in place."""
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE keyword_boost (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, keyword TEXT UNIQUE NOT NULL,
+        positive_count INTEGER DEFAULT 0, negative_count INTEGER DEFAULT 0,
+        boost_score REAL DEFAULT 0.0, last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+    conn.execute("INSERT INTO keyword_boost (keyword, positive_count, negative_count, boost_score) "
+                 "VALUES ('asthma', 3, 1, 0.0)")
+    conn.commit()
+    conn.close()
+
+    with _use_db(path):
+        db.init_db()
+        db.update_keyword_boost(["asthma"], positive=True)
+        [kw] = db.get_boosted_keywords()
+
+    assert (kw.positive_count, kw.negative_count) == (4, 1)
+    assert kw.boost_score == pytest.approx(0.8)
+
+
+def test_write_concurrent_with_close_pool(temp_db):
+    """A write that overlaps close_pool() finishes instead of deadlocking."""
+    in_writer = threading.Event()
+    original_insert = db._insert_visit
+
+    def slow_insert(conn, visit):
+        in_writer.set()
+        time.sleep(0.3)  # let close_pool() block on the writer lock meanwhile
+        return original_insert(conn, visit)
+
+    results = []
+    with patch.object(db, "_insert_visit", slow_insert):
+        writer = threading.Thread(target=lambda: results.append(db.save_visit(_visit())), daemon=True)
+        writer.start()
+        assert in_writer.wait(5)
+        closer = threading.Thread(target=db.close_pool, daemon=True)
+        closer.start()
+        writer.join(5)
+        closer.join(5)
+
+    assert not writer.is_alive() and not closer.is_alive()
+    assert len(results) == 1
@@ -110,6 +110,22 @@ def test_extract_json_invalid_raises():
         _extract_json_from_response("This is not JSON at all")
 
 
+def test_null_fields_coerced_to_defaults():
+    """LLM nulls in str/list fields become empty values instead of failing validation."""
+    summary = PatientSummary.model_validate({
+        "visit_summary": None,
+        "medications": [{"name": "Metformin", "dose": None, "frequency": None}],
+        "tests_ordered": None,
+    })
+    assert summary.visit_summary == ""
+    assert summary.medications[0].dose == ""
+    assert summary.tests_ordered == []
+
+    note = ClinicianNote.model_validate({"problem_list": None, "soap_note": {"plan": {"findings": None}}})
+    assert note.problem_list == []
+    assert note.soap_note.plan.findings == []
+
+
 # --- Retry logic tests ---
 
 @patch("core.extraction.call_ollama")
@@ -1,14 +1,31 @@
 """Tests for Whisper transcription module.
 
-Mocks Whisper model — no GPU or model download needed.
+Mocks the faster-whisper model — no GPU or model download needed.
 """
 
+import asyncio
 import wave
+from types import SimpleNamespace
+
 import pytest
 from unittest.mock import patch, MagicMock
 
-from core.transcription import transcribe_audio, _get_model, _model_cache
+from core.transcription import (
+    transcribe_audio, transcribe_audio_async, warmup,
+    _get_model, _get_pipeline, _model_cache, _pipeline_cache,
+)
 from models.schemas import TranscriptionResult
+from app.config import WHISPER_BATCH_SIZE
+
+
+def _seg(start, end, text):
+    """Build a stand-in for a faster-whisper Segment."""
+    return SimpleNamespace(start=start, end=end, text=text)
+
+
+def _info(duration, language="en"):
+    """Build a stand-in for faster-whisper TranscriptionInfo."""
+    return SimpleNamespace(duration=duration, language=language)
 
 
 @pytest.fixture
@@ -43,18 +60,15 @@ def test_file_not_found():
         transcribe_audio("/nonexistent/path/audio.wav")
 
 
-@patch("core.transcription._get_model")
-def test_transcription_mocked_whisper(mock_get_model, synthetic_wav):
+@patch("core.transcription._get_pipeline")
+def test_transcription_mocked_whisper(mock_get_pipeline, synthetic_wav):
     """Mocked Whisper should return a valid TranscriptionResult."""
     mock_model = MagicMock()
-    mock_model.transcribe.return_value = {
-        "text": " Hello, how are you feeling today?",
-        "segments": [
-            {"start": 0.0, "end": 2.5, "text": " Hello, how are you feeling today?"},
-        ],
-        "language": "en",
-    }
-    mock_get_model.return_value = mock_model
+    mock_model.transcribe.return_value = (
+        iter([_seg(0.0, 2.5, " Hello, how are you feeling today?")]),
+        _info(2.5),
+    )
+    mock_get_pipeline.return_value = mock_model
 
     result = transcribe_audio(synthetic_wav)
 
@@ -63,10 +77,14 @@ def test_transcription_mocked_whisper(mock_get_model, synthetic_wav):
     assert len(result.segments) == 1
     assert result.language == "en"
     assert result.duration_seconds == 2.5
-    mock_model.transcribe.assert_called_once_with(synthetic_wav)
+    mock_model.transcribe.assert_called_once()
+    args, kwargs = mock_model.transcribe.call_args
+    assert args == (synthetic_wav,)
+    assert kwargs["beam_size"] == 1
+    assert kwargs["vad_filter"] is True
 
 
-@patch("core.transcription.whisper.load_model")
+@patch("core.transcription.WhisperModel")
 def test_model_caching(mock_load):
     """Whisper model should be loaded once and cached for subsequent calls."""
     _model_cache.clear()
@@ -82,18 +100,30 @@ def test_model_caching(mock_load):
 
 
 @patch("core.transcription._get_model")
-def test_multi_segment_result(mock_get_model, synthetic_wav):
-    """Multi-segment transcription should calculate duration from last segment."""
+def test_pipeline_caching(mock_get_model):
+    """Batched pipeline should wrap the cached model and be reused."""
+    _pipeline_cache.clear()
+    mock_get_model.return_value = MagicMock()
+
+    pipeline1 = _get_pipeline("base")
+    pipeline2 = _get_pipeline("base")
+
+    assert pipeline1 is pipeline2
+    assert pipeline1.model is mock_get_model.return_value
+    mock_get_model.assert_called_once_with("base")
+
+    _pipeline_cache.clear()
+
+
+@patch("core.transcription._get_pipeline")
+def test_multi_segment_result(mock_get_pipeline, synthetic_wav):
+    """Multi-segment transcription should report the decoded audio duration."""
     mock_model = MagicMock()
-    mock_model.transcribe.return_value = {
-        "text": " Segment one. Segment two.",
-        "segments": [
-            {"start": 0.0, "end": 1.5, "text": " Segment one."},
-            {"start": 1.5, "end": 3.0, "text": " Segment two."},
-        ],
-        "language": "en",
-    }
-    mock_get_model.return_value = mock_model
+    mock_model.transcribe.return_value = (
+        iter([_seg(0.0, 1.5, " Segment one."), _seg(1.5, 3.0, " Segment two.")]),
+        _info(3.0),
+    )
+    mock_get_pipeline.return_value = mock_model
 
     result = transcribe_audio(synthetic_wav)
 
@@ -102,3 +132,48 @@ def test_multi_segment_result(mock_get_model, synthetic_wav):
     assert result.segments[0].start_time == 0.0
     assert result.segments[0].end_time == 1.5
     assert "Segment two." in result.segments[1].text
+
+
+@patch("core.transcription._get_pipeline")
+def test_warmup_runs_pipeline_on_silence(mock_get_pipeline):
+    """Warmup should run the batched pipeline on silence with the request-path arguments."""
+    mock_pipeline = MagicMock()
+    mock_pipeline.transcribe.return_value = (iter([]), _info(0.5))
+    mock_get_pipeline.return_value = mock_pipeline
+
+    warmup("base")
+
+    mock_get_pipeline.assert_called_once_with("base")
+    args, kwargs = mock_pipeline.transcribe.call_args
+    assert args[0].dtype.name == "float32"
+    assert not args[0].any()
+    assert kwargs["batch_size"] == WHISPER_BATCH_SIZE
+    assert kwargs["beam_size"] == 1
+    assert kwargs["vad_filter"] is True
+
+
+@patch("core.transcription._get_pipeline")
+def test_async_transcription_matches_sync(mock_get_pipeline, synthetic_wav):
+    """Async wrapper should return the same result as the sync call."""
+    mock_model = MagicMock()
+    mock_model.transcribe.return_value = (iter([_seg(0.0, 1.0, " Hi.")]), _info(1.0))
+    mock_get_pipeline.return_value = mock_model
+
+    result = asyncio.run(transcribe_audio_async(synthetic_wav))
+
+    assert result.text == "Hi."
+    assert result.duration_seconds == 1.0
+
+
+@patch("core.transcription._get_pipeline", side_effect=RuntimeError("model download failed"))
+def test_startup_survives_failed_warmup(mock_get_pipeline):
+    """A Whisper load failure during warmup should not stop the API from starting."""
+    from fastapi.testclient import TestClient
+    import app.main as main
+
+    with patch.object(main, "WHISPER_WARMUP", True), \
+            patch.object(main, "init_db"), patch.object(main, "close_pool"):
+        with TestClient(main.app) as client:
+            assert client.get("/health").json() == {"status": "ok"}
+
+    mock_get_pipeline.assert_called_once()
@@ -0,0 +1,142 @@
+"""Tests for post-extraction validation and grounding scores.
+
+Pure-Python checks against small synthetic transcripts — no models needed.
+"""
+
+import re
+
+import pytest
+from rapidfuzz import fuzz
+
+from core.validation import (
+    _batch_evidence_scores,
+    _check_evidence,
+    compute_grounding_report,
+    validate_clinician_note,
+    validate_patient_summary,
+)
+from models.schemas import (
+    PatientSummary, ClinicianNote, Medication, ActionItem,
+)
+
+
+TRANSCRIPT = (
+    "Doctor: I'm going to start you on metformin 500 milligrams twice daily with meals. "
+    "Patient: Okay. Should I change my diet? "
+    "Doctor: Yes, cut back on sugary drinks and walk thirty minutes a day. "
+    "We'll recheck your A1C in three months."
+)
+
+
+def test_evidence_score_exact_substring():
+    """An exact quote should score 1.0 regardless of case."""
+    assert _batch_evidence_scores(["Metformin 500 milligrams"], TRANSCRIPT.lower()) == [1.0]
+
+
+def test_evidence_score_near_match_scores_high():
+    """A lightly paraphrased quote should still score well above unrelated text."""
+    near, unrelated = _batch_evidence_scores(
+        ["start you on metformin 500 mg twice daily", "schedule a knee MRI next week"],
+        TRANSCRIPT.lower(),
+    )
+    assert near > 0.8
+    assert near > unrelated
+
+
+def test_evidence_score_empty_inputs():
+    """Empty evidence or transcript should score 0."""
+    assert _batch_evidence_scores(["", "   "], TRANSCRIPT.lower()) == [0.0, 0.0]
+    assert _batch_evidence_scores(["metformin"], "") == [0.0]
+
+
+def test_grounding_report_flags_hallucination():
+    """Grounded items should outscore items absent from the transcript."""
+    summary = PatientSummary(medications=[
+        Medication(name="Metformin", dose="500 milligrams", frequency="twice daily",
+                   evidence="metformin 500 milligrams twice daily"),
+        Medication(name="Warfarin", dose="5mg", frequency="nightly",
+                   evidence="take warfarin every night"),
+    ])
+    note = ClinicianNote(action_items=[
+        ActionItem(action="Recheck A1C in three months", evidence="recheck your A1C in three months"),
+    ])
+
+    report = compute_grounding_report(summary, note, TRANSCRIPT)
+
+    assert report["total_items"] == 3
+    by_item = {it["item"]: it for it in report["items"]}
+    assert by_item["Metformin"]["flag"] == "grounded"
+    assert by_item["Metformin"]["score"] > by_item["Warfarin"]["score"]
+    assert by_item["Recheck A1C in three months"]["evidence_match"] == 1.0
+
+
+def test_grounding_report_empty():
+    """No extracted items should produce an empty, uncertain report."""
+    report = compute_grounding_report(PatientSummary(), ClinicianNote(), TRANSCRIPT)
+    assert report["total_items"] == 0
+    assert report["overall_flag"] == "uncertain"
+
+
+def test_validate_patient_summary_marks_verified():
+    """Evidence found in the transcript is verified; blank items are dropped."""
+    summary = PatientSummary(medications=[
+        Medication(name="Metformin", evidence="metformin 500 milligrams twice daily"),
+        Medication(name="Warfarin", evidence="take warfarin every night"),
+        Medication(name="  ", evidence="metformin"),
+    ])
+
+    result = validate_patient_summary(summary, TRANSCRIPT)
+
+    assert [m.name for m in result.medications] == ["Metformin", "Warfarin"]
+    assert result.medications[0].verified is True
+    assert result.medications[1].verified is False
+
+
+def test_check_evidence_shares_word_hits():
+    """Loose keyword matches reuse the shared per-word cache across calls."""
+    transcript_lower = TRANSCRIPT.lower()
+    word_hits = {}
+
+    assert _check_evidence("Metformin with meals, milligrams daily", transcript_lower, word_hits)
+    assert word_hits["metformin"] is True
+    assert not _check_evidence("warfarin nightly with meals", transcript_lower, word_hits)
+    assert word_hits["warfarin"] is False
+
+
+def test_check_evidence_token_set_keeps_substring_matches():
+    """Whole-word hits come from the token set; partial words still match by substring."""
+    transcript_lower = TRANSCRIPT.lower()
+    transcript_words = frozenset(re.findall(r"\b\w{3,}\b", transcript_lower))
+    word_hits = {}
+
+    # "milligram" is not a transcript token but is a substring of "milligrams"
+    assert _check_evidence("metformin milligram daily", transcript_lower, word_hits, transcript_words)
+    assert word_hits == {"metformin": True, "milligram": True, "daily": True}
+    assert not _check_evidence("warfarin nightly", transcript_lower, word_hits, transcript_words)
+
+
+def test_batch_evidence_scores_match_partial_ratio():
+    """Batched cdist scoring agrees with scoring each quote on its own."""
+    transcript_lower = TRANSCRIPT.lower()
+    evidences = [
+        "start you on metformin 500 mg twice daily",
+        "schedule a knee MRI next week",
+        "walk 30 minutes every day",
+    ]
+    batched = _batch_evidence_scores(evidences, transcript_lower)
+    single = [fuzz.partial_ratio(e.lower(), transcript_lower) / 100.0 for e in evidences]
+    assert batched == pytest.approx(single, abs=1e-4)
+
+
+def test_validate_clinician_note_drops_blank_actions():
+    """Action items go through the same drop-blank / verify pass as the summary."""
+    note = ClinicianNote(action_items=[
+        ActionItem(action="Recheck A1C", evidence="recheck your A1C in three months"),
+        ActionItem(action="   ", evidence="metformin"),
+        ActionItem(action="Order chest X-ray", evidence="get a chest x-ray today"),
+    ])
+
+    result = validate_clinician_note(note, TRANSCRIPT)
+
+    assert [a.action for a in result.action_items] == ["Recheck A1C", "Order chest X-ray"]
+    assert [a.verified for a in result.action_items] == [True, False]